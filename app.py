@@ -1,6 +1,8 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, Response, stream_with_context
 from flask_cors import CORS
-import json
+import hashlib
+import hmac
+import io
 import os
 import time
 from dotenv import load_dotenv
@@ -13,16 +15,27 @@ from modules.ai_skill_assessment import AISkillAssessment
 from modules.ai_interview_prep import AIInterviewPreparation
 from modules.gemini_ai_engine import GeminiAIEngine
 from modules.advanced_mock_interview import AdvancedMockInterview
+from modules.analysis_pipeline import build_analysis_pipeline, normalize_student_data, FieldSelection
+from modules.batch_analysis import BatchAnalyzer, iter_jsonl
+from modules.result_cache import AnalysisCache
+from modules.json_fragments import FragmentJSONProvider, dumps
+from modules.catalog_version import ensure_catalog_version_tracking
+from modules.skill_catalog import ensure_alias_table
+from modules.skill_normalizer import DEFAULT_ALIASES
+from modules.skill_search import SkillSearch
+from modules.catalog_importer import CatalogImporter, CATALOG_SPECS, iter_records, ensure_unique_career_titles
 import sqlite3
 
 # Load environment variables
 load_dotenv()
 
 app = Flask(__name__)
+app.json = FragmentJSONProvider(app)  # Splices pre-serialized market sections into responses
 CORS(app)
 
 # Initialize AI modules
 skill_mapper = SkillMappingEngine()
+skill_search = SkillSearch(skill_mapper.catalog)  # Typeahead index over skill names and aliases
 job_analyzer = JobMarketAnalyzer()
 career_recommender = CareerRecommender()
 learning_planner = LearningPlanGenerator()
@@ -32,6 +45,25 @@ ai_interview = AIInterviewPreparation()
 gemini_engine = GeminiAIEngine()  # Advanced Gemini AI Engine
 mock_interview = AdvancedMockInterview()  # Advanced Mock Interview Module
 
+# Dependency-graph executor for /api/analyze (bounded thread pool shared by all requests)
+analysis_pipeline = build_analysis_pipeline(
+    skill_mapper, job_analyzer, career_recommender, learning_planner, resume_prep,
+    max_workers=int(os.getenv('ANALYSIS_MAX_WORKERS', '4'))
+)
+
+# Two-tier (in-process LRU + shared SQLite) cache of analysis results
+analysis_cache = AnalysisCache(
+    catalog_db_path='career_advisor.db',
+    cache_db_path=os.getenv('ANALYSIS_CACHE_DB', 'analysis_cache.db'),
+    market_data_version=job_analyzer.market_data_version,
+    max_entries=int(os.getenv('ANALYSIS_CACHE_SIZE', '1024')),
+    max_disk_entries=int(os.getenv('ANALYSIS_CACHE_DISK_SIZE', '50000')),
+    ttl_seconds=float(os.getenv('ANALYSIS_CACHE_TTL', '3600'))
+)
+
+# Process pool for cohort runs, started on the first /api/analyze/batch request
+batch_analyzer = None
+
 @app.route('/')
 def index():
     """Hackathon Edition - Advanced Gemini Features (Main Page)"""
@@ -52,55 +84,275 @@ def mock_interview_demo():
     """Advanced Mock Interview Demo Page"""
     return render_template('mock_interview_demo.html')
 
+def _requested_fields(data: dict) -> FieldSelection:
+    """Read the optional ``fields``/``include`` selection from the query string or JSON body"""
+    fields = (request.args.get('fields') or request.args.get('include') or
+              data.get('fields') or data.get('include'))
+    return FieldSelection(fields)
+
 @app.route('/api/analyze', methods=['POST'])
 def analyze_student():
     try:
         data = request.json
-        student_data = {
-            'skills': data.get('skills', []),
-            'interests': data.get('interests', []),
-            'education': data.get('education', ''),
-            'experience': data.get('experience', ''),
-            'goals': data.get('goals', '')
-        }
-        
-        # Step 1: Skill Mapping
-        skill_analysis = skill_mapper.analyze_skills(student_data)
+        student_data = normalize_student_data(data, skill_mapper.normalizer)
+        try:
+            fields = _requested_fields(data)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
         
-        # Step 2: Job Market Analysis
-        market_analysis = job_analyzer.analyze_market(skill_analysis)
+        cache_key = analysis_cache.make_key(student_data, fields.cache_key())
+        sections = analysis_cache.get(cache_key)
+        if sections is not None:
+            return jsonify(dict(sections, success=True, cached=True))
         
-        # Step 3: Career Recommendations
-        career_recommendations = career_recommender.get_recommendations(
-            skill_analysis, market_analysis, student_data
+        # Run skill mapping -> market analysis -> career recommendations,
+        # then learning plan and resume guidance concurrently
+        results, stage_timings = analysis_pipeline.run(
+            {'student_data': student_data, 'fields': fields}, targets=fields.targets
         )
         
-        # Step 4: Learning Plan
-        learning_plan = learning_planner.generate_plan(
-            skill_analysis, career_recommendations, student_data
-        )
-        
-        # Step 5: Resume & Interview Prep
-        resume_guidance = resume_prep.prepare_guidance(
-            student_data, career_recommendations, skill_analysis
-        )
-        
-        return jsonify({
-            'success': True,
-            'skill_analysis': skill_analysis,
-            'market_analysis': market_analysis,
-            'career_recommendations': career_recommendations,
-            'learning_plan': learning_plan,
-            'resume_guidance': resume_guidance
-        })
+        sections = {section: fields.project(section, results[section]) for section in fields.targets}
+        analysis_cache.set(cache_key, sections)
+        return jsonify(dict(sections, success=True, cached=False, stage_timings=stage_timings))
         
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/analyze/stream', methods=['POST'])
+def analyze_student_stream():
+    """Stream each analysis section as soon as its stage finishes (NDJSON, or SSE on request)"""
+    data = request.json or {}
+    student_data = normalize_student_data(data, skill_mapper.normalizer)
+    try:
+        fields = _requested_fields(data)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    use_sse = (request.args.get('format') == 'sse' or
+               'text/event-stream' in request.headers.get('Accept', ''))
+    
+    def encode(event: str, payload: dict) -> str:
+        if use_sse:
+            return f"event: {event}\ndata: {dumps(payload)}\n\n"
+        return dumps(payload) + '\n'
+    
+    def generate():
+        stage_timings = {}
+        try:
+            cache_key = analysis_cache.make_key(student_data, fields.cache_key())
+            sections = analysis_cache.get(cache_key)
+            if sections is not None:
+                for section, result in sections.items():
+                    yield encode(section, {'section': section, 'data': result, 'elapsed_ms': 0.0})
+                yield encode('complete', {'section': 'complete', 'success': True, 'cached': True,
+                                          'stage_timings': {}})
+                return
+            
+            sections = {}
+            initial = {'student_data': student_data, 'fields': fields}
+            for section, result, elapsed_ms in analysis_pipeline.run_iter(initial, targets=fields.targets):
+                stage_timings[section] = elapsed_ms
+                if section in fields.targets:
+                    sections[section] = fields.project(section, result)
+                    yield encode(section, {'section': section, 'data': sections[section],
+                                           'elapsed_ms': elapsed_ms})
+            analysis_cache.set(cache_key, sections)
+            yield encode('complete', {'section': 'complete', 'success': True, 'cached': False,
+                                      'stage_timings': stage_timings})
+        except Exception as e:
+            yield encode('error', {'section': 'error', 'success': False, 'error': str(e)})
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream' if use_sse else 'application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/api/analyze/batch', methods=['POST'])
+def analyze_batch():
+    """Analyze a cohort of profiles (JSONL body or JSON list) and stream JSONL results in order"""
+    global batch_analyzer
+    try:
+        fields = request.args.get('fields') or request.args.get('include')
+        FieldSelection(fields)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    if request.is_json:
+        data = request.get_json()
+        profiles = data.get('profiles', []) if isinstance(data, dict) else data
+        if not isinstance(profiles, list):
+            return jsonify({'success': False, 'error': 'Expected a list of profiles'}), 400
+    else:
+        # JSONL is parsed lazily while results stream back
+        profiles = iter_jsonl(request.stream)
+    
+    if batch_analyzer is None:
+        workers = os.getenv('BATCH_ANALYSIS_WORKERS')
+        batch_analyzer = BatchAnalyzer(workers=int(workers) if workers else None)
+    
+    def generate():
+        for result in batch_analyzer.analyze(profiles, fields=fields):
+            yield dumps(result) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@app.route('/api/analyze/cache/stats', methods=['GET'])
+def analysis_cache_stats():
+    """Hit/miss counters for the analysis result cache"""
+    return jsonify(analysis_cache.get_stats())
+
 @app.route('/api/skills', methods=['GET'])
 def get_skills():
-    """Get available skills from the database"""
-    return jsonify(skill_mapper.get_available_skills())
+    """
+    Get available skills from the database. With ``q``, ``limit`` or
+    ``cursor`` this becomes a paginated typeahead over names and aliases.
+    """
+    paginated = any(arg in request.args for arg in ('q', 'limit', 'cursor'))
+    snapshot = skill_mapper.catalog.current()
+    etag = hashlib.sha1(
+        f"{snapshot.version}|{request.query_string.decode('utf-8') if paginated else ''}".encode('utf-8')
+    ).hexdigest()
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    elif not paginated:
+        response = jsonify(list(snapshot.skills))
+    else:
+        try:
+            limit = min(max(int(request.args.get('limit', 20)), 1), 100)
+            response = jsonify(skill_search.search(request.args.get('q', ''), limit, request.args.get('cursor')))
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'public, max-age=60'
+    return response
+
+def _admin_error():
+    """Return an error response unless the request carries the admin token"""
+    token = os.getenv('ADMIN_API_TOKEN')
+    if not token:
+        return jsonify({'success': False, 'error': 'Admin API is disabled (ADMIN_API_TOKEN not set)'}), 403
+    if not hmac.compare_digest(request.headers.get('X-Admin-Token', ''), token):
+        return jsonify({'success': False, 'error': 'Invalid admin token'}), 401
+    return None
+
+@app.route('/api/admin/skills', methods=['POST'])
+def admin_add_skill():
+    """Add a skill to the taxonomy; the live skill vectors are updated in place"""
+    error = _admin_error()
+    if error:
+        return error
+    try:
+        data = request.json or {}
+        name = (data.get('name') or '').strip()
+        if not name:
+            return jsonify({'success': False, 'error': 'name is required'}), 400
+        if not skill_mapper.catalog.add_skill(name, data.get('category', 'Technical'),
+                                              data.get('description', '')):
+            return jsonify({'success': False, 'error': f'Skill already exists: {name}'}), 409
+        snapshot = skill_mapper.refresh()
+        return jsonify({'success': True, 'skill': snapshot.skills[snapshot.index_by_name[name]],
+                        'catalog_version': snapshot.version}), 201
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/admin/skills/<path:name>', methods=['PUT'])
+def admin_update_skill(name):
+    """Edit a skill's category and/or description"""
+    error = _admin_error()
+    if error:
+        return error
+    try:
+        data = request.json or {}
+        if not skill_mapper.catalog.update_skill(name, data.get('category'), data.get('description')):
+            return jsonify({'success': False, 'error': f'Unknown skill: {name}'}), 404
+        snapshot = skill_mapper.refresh()
+        return jsonify({'success': True, 'skill': snapshot.skills[snapshot.index_by_name[name]],
+                        'catalog_version': snapshot.version})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/admin/skills/<path:name>', methods=['DELETE'])
+def admin_delete_skill(name):
+    """Remove a skill from the taxonomy"""
+    error = _admin_error()
+    if error:
+        return error
+    try:
+        if not skill_mapper.catalog.delete_skill(name):
+            return jsonify({'success': False, 'error': f'Unknown skill: {name}'}), 404
+        snapshot = skill_mapper.refresh()
+        return jsonify({'success': True, 'catalog_version': snapshot.version})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/admin/import/<table>', methods=['POST'])
+def admin_import_catalog(table):
+    """Bulk import skills or careers from a streamed CSV or JSONL body"""
+    error = _admin_error()
+    if error:
+        return error
+    if table not in CATALOG_SPECS:
+        return jsonify({'success': False, 'error': f'Unknown catalog table: {table}'}), 404
+    try:
+        fmt = request.args.get('format') or ('csv' if 'csv' in (request.mimetype or '') else 'jsonl')
+        lines = io.TextIOWrapper(request.stream, encoding='utf-8', newline='')
+        stats = CatalogImporter('career_advisor.db').import_records(table, iter_records(lines, fmt))
+        
+        # Rebuild derived indexes now rather than on the next analysis request
+        if table == 'skills':
+            skill_mapper.refresh()
+        else:
+            career_recommender.refresh()
+        return jsonify({'success': True, 'table': table, **stats})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/market/snapshot', methods=['GET'])
+def get_market_snapshot():
+    """Profile-independent market sections, cacheable until the market data changes"""
+    snapshot = job_analyzer.get_market_snapshot()
+    if request.if_none_match.contains(snapshot.etag):
+        response = Response(status=304)
+    else:
+        response = Response(snapshot.json, mimetype='application/json')
+    response.set_etag(snapshot.etag)
+    response.headers['Cache-Control'] = 'public, max-age=60'
+    return response
+
+@app.route('/api/salaries', methods=['GET'])
+def get_salary_statistics():
+    """Salary percentiles and ranges over the career catalog (``industry``, ``currency``, ``salary``, ``percentile``, ``min``, ``max``)"""
+    def number(name):
+        value = request.args.get(name)
+        return float(value) if value else None
+    
+    try:
+        return jsonify(career_recommender.salary_statistics(
+            industry=request.args.get('industry') or None,
+            currency=(request.args.get('currency') or 'INR').upper(),
+            salary=number('salary'), percentile=number('percentile'),
+            salary_min=number('min'), salary_max=number('max')
+        ))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/careers/paths', methods=['GET'])
+def get_career_paths():
+    """Transition path between roles (``from``, ``to``) or the roles within ``hops`` of ``from``"""
+    try:
+        source = request.args.get('from')
+        if not source:
+            raise ValueError('from is required')
+        hops = int(request.args.get('hops', 2))
+        if not 1 <= hops <= 6:
+            raise ValueError('hops must be between 1 and 6')
+        return jsonify(career_recommender.career_paths(source, request.args.get('to') or None, hops))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/industries', methods=['GET'])
 def get_industries():
@@ -134,6 +386,9 @@ def init_database():
         )
     ''')
     
+    # Dedupe careers on title so re-seeding does not add copies
+    ensure_unique_career_titles(conn)
+    
     # Insert sample data
     sample_skills = [
         ('Python Programming', 'Technical', 'Programming language for data science and web development'),
@@ -160,7 +415,14 @@ def init_database():
     
     cursor.executemany('INSERT OR IGNORE INTO careers (title, industry, required_skills, salary_range, growth_rate, description) VALUES (?, ?, ?, ?, ?, ?)', sample_careers)
     
+    # Common alternative spellings used when canonicalizing profile skills
+    ensure_alias_table(conn)
+    cursor.executemany('INSERT OR IGNORE INTO skill_aliases (alias, skill_name) VALUES (?, ?)', DEFAULT_ALIASES)
+    
     conn.commit()
+    
+    # Catalog version counter used to invalidate cached analyses
+    ensure_catalog_version_tracking(conn)
     conn.close()
 
 # AI Skill Assessment Routes
@@ -0,0 +1,231 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, List, Any, Callable, Iterator, Tuple, Optional, Set, Union
+
+
+class PipelineStage:
+    def __init__(self, name: str, func: Callable, inputs: List[str]):
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+
+
+class AnalysisPipeline:
+    """
+    Small dependency-graph executor for the student analysis pipeline.
+
+    Each stage declares the names of the values it consumes; a stage is
+    submitted to the shared thread pool as soon as all of its inputs are
+    available, so independent stages run concurrently and the end-to-end
+    latency follows the critical path instead of the sum of all stages.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.stages: Dict[str, PipelineStage] = {}
+        self.executor = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix='analysis-stage')
+
+    def add_stage(self, name: str, func: Callable, inputs: List[str]) -> 'AnalysisPipeline':
+        """Register a stage; ``func`` is called with its inputs positionally"""
+        if name in self.stages:
+            raise ValueError(f'Duplicate pipeline stage: {name}')
+        self.stages[name] = PipelineStage(name, func, inputs)
+        return self
+
+    def run_iter(self, initial: Dict[str, Any],
+                 targets: Optional[Set[str]] = None) -> Iterator[Tuple[str, Any, float]]:
+        """
+        Run the stages needed for ``targets`` (all stages by default), yielding
+        ``(stage_name, result, elapsed_ms)`` in completion order. The first
+        stage failure is re-raised and any stages that have not started yet
+        are cancelled.
+        """
+        values = dict(initial)
+        pending = {name: self.stages[name] for name in self._required_stages(targets)}
+        running = {}
+
+        for stage in pending.values():
+            for dependency in stage.inputs:
+                if dependency not in values and dependency not in self.stages:
+                    raise ValueError(f'Stage {stage.name} depends on unknown input: {dependency}')
+
+        def submit_ready():
+            for name in [n for n, s in pending.items() if all(i in values for i in s.inputs)]:
+                stage = pending.pop(name)
+                args = [values[i] for i in stage.inputs]
+                running[self.executor.submit(self._timed_call, stage.func, args)] = name
+
+        submit_ready()
+        try:
+            while running:
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    result, elapsed_ms = future.result()
+                    values[name] = result
+                    yield name, result, elapsed_ms
+                submit_ready()
+        finally:
+            for future in running:
+                future.cancel()
+
+        if pending:
+            raise ValueError(f'Unresolvable pipeline stages: {", ".join(sorted(pending))}')
+
+    def run(self, initial: Dict[str, Any],
+            targets: Optional[Set[str]] = None) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        """Run the stages needed for ``targets`` and return ``(results, stage_timings_ms)``"""
+        results = {}
+        timings = {}
+        for name, result, elapsed_ms in self.run_iter(initial, targets):
+            results[name] = result
+            timings[name] = elapsed_ms
+        return results, timings
+
+    def _required_stages(self, targets: Optional[Set[str]]) -> Set[str]:
+        """Resolve ``targets`` to the set of stages they transitively depend on"""
+        if targets is None:
+            return set(self.stages)
+
+        required = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name in required:
+                continue
+            if name not in self.stages:
+                raise ValueError(f'Unknown pipeline stage: {name}')
+            required.add(name)
+            stack.extend(i for i in self.stages[name].inputs if i in self.stages)
+        return required
+
+    @staticmethod
+    def _timed_call(func: Callable, args: List[Any]) -> Tuple[Any, float]:
+        start = time.perf_counter()
+        result = func(*args)
+        return result, round((time.perf_counter() - start) * 1000, 2)
+
+
+class FieldSelection:
+    """
+    Sparse field selection for the analysis response.
+
+    ``fields`` is a comma-separated string (or list) of top-level sections,
+    optionally narrowed to sub-sections with dotted paths, e.g.
+    ``career_recommendations.top_careers,skill_analysis.skill_gaps``.
+    Engines receive the requested sub-section names through ``include`` and
+    skip building everything else; sections only needed as inputs to other
+    stages are built with their core keys only.
+    """
+
+    SECTIONS = ('skill_analysis', 'market_analysis', 'career_recommendations',
+                'learning_plan', 'resume_guidance')
+
+    def __init__(self, fields: Union[str, List[str], None] = None):
+        # section -> requested sub-sections (None means the whole section)
+        self.sections: Dict[str, Optional[Set[str]]] = {}
+
+        if isinstance(fields, str):
+            fields = fields.split(',')
+        fields = [f.strip() for f in (fields or []) if f and f.strip()]
+
+        if not fields:
+            self.sections = {section: None for section in self.SECTIONS}
+            return
+
+        for field in fields:
+            section, _, sub_field = field.partition('.')
+            if section not in self.SECTIONS:
+                raise ValueError(f'Unknown field: {field}')
+            if not sub_field:
+                self.sections[section] = None
+            elif section not in self.sections:
+                self.sections[section] = {sub_field}
+            elif self.sections[section] is not None:
+                self.sections[section].add(sub_field)
+
+    @property
+    def targets(self) -> Set[str]:
+        """Pipeline stages whose output was requested"""
+        return set(self.sections)
+
+    def include_for(self, section: str) -> Optional[Set[str]]:
+        """Sub-sections an engine should build (None means all of them)"""
+        if section not in self.sections:
+            return set()
+        return self.sections[section]
+
+    def project(self, section: str, result: Any) -> Any:
+        """Drop any sub-sections of ``result`` the client did not ask for"""
+        include = self.sections.get(section)
+        if include is None or not isinstance(result, dict):
+            return result
+        return {key: value for key, value in result.items() if key in include or key == 'error'}
+
+    def cache_key(self) -> str:
+        """Canonical, order-independent representation of the selection"""
+        return ','.join(
+            section if include is None else ','.join(f'{section}.{sub}' for sub in sorted(include))
+            for section, include in sorted(self.sections.items())
+        )
+
+
+def build_analysis_pipeline(skill_mapper, job_analyzer, career_recommender,
+                            learning_planner, resume_prep, max_workers: int = 4) -> AnalysisPipeline:
+    """Wire the five analysis engines into a pipeline keyed on ``student_data`` and ``fields``"""
+    pipeline = AnalysisPipeline(max_workers=max_workers)
+    pipeline.add_stage(
+        'skill_analysis',
+        lambda student_data, fields: skill_mapper.analyze_skills(
+            student_data, include=fields.include_for('skill_analysis')),
+        ['student_data', 'fields'])
+    pipeline.add_stage(
+        'market_analysis',
+        lambda skill_analysis, fields: job_analyzer.analyze_market(
+            skill_analysis, include=fields.include_for('market_analysis')),
+        ['skill_analysis', 'fields'])
+    pipeline.add_stage(
+        'career_recommendations',
+        lambda skill_analysis, market_analysis, student_data, fields: career_recommender.get_recommendations(
+            skill_analysis, market_analysis, student_data, include=fields.include_for('career_recommendations')),
+        ['skill_analysis', 'market_analysis', 'student_data', 'fields'])
+    # Learning plan and resume guidance only depend on the recommendations,
+    # so they run side by side on the pool
+    pipeline.add_stage(
+        'learning_plan',
+        lambda skill_analysis, career_recommendations, student_data, fields: learning_planner.generate_plan(
+            skill_analysis, career_recommendations, student_data, include=fields.include_for('learning_plan')),
+        ['skill_analysis', 'career_recommendations', 'student_data', 'fields'])
+    pipeline.add_stage(
+        'resume_guidance',
+        lambda student_data, career_recommendations, skill_analysis, fields: resume_prep.prepare_guidance(
+            student_data, career_recommendations, skill_analysis, include=fields.include_for('resume_guidance')),
+        ['student_data', 'career_recommendations', 'skill_analysis', 'fields'])
+    return pipeline
+
+
+def normalize_student_data(data: Dict[str, Any], skill_normalizer=None) -> Dict[str, Any]:
+    """
+    Extract the student profile fields used by the analysis pipeline in
+    canonical form: skills and interests de-duplicated and sorted, text
+    fields trimmed. Equivalent submissions therefore produce identical
+    profiles (and identical cache keys). With a ``skill_normalizer``,
+    skills are also mapped to their catalog names ("python 3" ->
+    "Python Programming") before any engine sees them.
+    """
+    def canonical_list(values) -> List[str]:
+        if isinstance(values, str):
+            values = [values]
+        return sorted({str(v).strip() for v in values or [] if str(v).strip()})
+
+    skills = canonical_list(data.get('skills', []))
+    if skill_normalizer is not None:
+        skills = skill_normalizer.canonicalize(skills)
+
+    return {
+        'skills': skills,
+        'interests': canonical_list(data.get('interests', [])),
+        'education': str(data.get('education') or '').strip(),
+        'experience': str(data.get('experience') or '').strip(),
+        'goals': str(data.get('goals') or '').strip()
+    }
@@ -0,0 +1,146 @@
+"""
+Batch cohort analysis.
+
+Runs the full analysis pipeline for many student profiles on a process pool.
+Each worker builds the analysis engines once and then handles profiles one
+after another, while the parent keeps a bounded window of profiles in flight
+and yields results in input order.
+
+Command line usage:
+    python -m modules.batch_analysis students.jsonl -o results.jsonl --workers 8
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Iterable, Iterator, Optional
+
+from modules.analysis_pipeline import build_analysis_pipeline, normalize_student_data, FieldSelection
+from modules.json_fragments import dumps
+
+# Per-process pipeline and skill normalizer, created by _init_worker
+_worker_pipeline = None
+_worker_normalizer = None
+
+
+class _InvalidLine(dict):
+    """Placeholder for an input line that is not valid JSON"""
+
+
+def _init_worker():
+    """Build the analysis engines once per worker process"""
+    global _worker_pipeline, _worker_normalizer
+    from modules.skill_mapping import SkillMappingEngine
+    from modules.job_market_analysis import JobMarketAnalyzer
+    from modules.career_recommender import CareerRecommender
+    from modules.learning_planner import LearningPlanGenerator
+    from modules.resume_prep import ResumePreparation
+
+    skill_mapper = SkillMappingEngine()
+    _worker_normalizer = skill_mapper.normalizer
+    _worker_pipeline = build_analysis_pipeline(
+        skill_mapper, JobMarketAnalyzer(), CareerRecommender(),
+        LearningPlanGenerator(), ResumePreparation(), max_workers=1
+    )
+
+
+def _analyze_profile(index: int, profile: Any, fields: Optional[str]) -> Dict[str, Any]:
+    """Analyze one profile inside a worker; failures are reported, not raised"""
+    result = {'index': index}
+    try:
+        if isinstance(profile, _InvalidLine):
+            raise ValueError(profile['error'])
+        if not isinstance(profile, dict):
+            raise ValueError('Profile must be a JSON object')
+        if 'id' in profile:
+            result['id'] = profile['id']
+
+        selection = FieldSelection(fields)
+        results, stage_timings = _worker_pipeline.run(
+            {'student_data': normalize_student_data(profile, _worker_normalizer), 'fields': selection},
+            targets=selection.targets
+        )
+        result['success'] = True
+        for section in selection.targets:
+            result[section] = selection.project(section, results[section])
+        result['stage_timings'] = stage_timings
+    except Exception as e:
+        result['success'] = False
+        result['error'] = str(e)
+    return result
+
+
+def iter_jsonl(lines: Iterable) -> Iterator[Any]:
+    """Parse JSONL lines lazily, skipping blanks and flagging malformed lines"""
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            yield _InvalidLine(error=f'Invalid JSON: {e}')
+
+
+class BatchAnalyzer:
+    """Process-pool fan-out of the analysis pipeline over many profiles"""
+
+    def __init__(self, workers: Optional[int] = None, max_in_flight: Optional[int] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_in_flight = max_in_flight or self.workers * 4
+        # Spawned workers do not inherit the parent's threads or open SQLite handles
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker
+        )
+
+    def analyze(self, profiles: Iterable[Any], fields: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yield one result per profile, in input order, with bounded memory"""
+        in_flight = deque()
+        for index, profile in enumerate(profiles):
+            in_flight.append(self.executor.submit(_analyze_profile, index, profile, fields))
+            if len(in_flight) >= self.max_in_flight:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Run the career analysis pipeline for a JSONL file of student profiles')
+    parser.add_argument('input', help="JSONL file with one student profile per line ('-' for stdin)")
+    parser.add_argument('-o', '--output', default='-', help="JSONL output file ('-' for stdout)")
+    parser.add_argument('-w', '--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--fields', default=None, help='Comma-separated sections to include, e.g. career_recommendations.top_careers')
+    args = parser.parse_args(argv)
+
+    FieldSelection(args.fields)  # Fail fast on unknown fields
+
+    source = sys.stdin if args.input == '-' else open(args.input, 'r', encoding='utf-8')
+    sink = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    analyzer = BatchAnalyzer(workers=args.workers)
+    failures = 0
+    try:
+        for result in analyzer.analyze(iter_jsonl(source), fields=args.fields):
+            failures += 0 if result['success'] else 1
+            sink.write(dumps(result) + '\n')
+    finally:
+        analyzer.shutdown()
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+Career progression graph.
+
+Roles are nodes; the ``entry_level``, ``senior_level`` and ``leadership_path``
+fields of each career become promotion edges (entry -> career -> senior ->
+leadership) and ``alternative_roles`` become lateral edges in both
+directions. Path and neighbourhood queries are answered from one
+breadth-first search per source role, cached, so repeated queries from the
+same role cost a dictionary walk.
+"""
+import threading
+from collections import OrderedDict, deque
+from typing import Dict, List, Any, Optional, Tuple
+
+PROMOTION = 'promotion'
+LATERAL = 'lateral'
+
+# Source roles whose BFS results are kept
+BFS_CACHE_SIZE = 1024
+
+
+class _Reach:
+    """BFS tree from one source: hop distance and (parent, transition) of every reachable role"""
+
+    def __init__(self, distances: List[Tuple[int, int]], parents: Dict[int, Tuple[int, str]]):
+        self.distances = distances  # (role, hops) in BFS order, i.e. by distance
+        self.parents = parents
+
+
+class CareerGraph:
+    """Adjacency-list graph of roles with promotion and lateral transition edges"""
+
+    def __init__(self, career_database: Dict[str, Dict[str, Any]]):
+        self.titles: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._adjacency: List[List[Tuple[int, str]]] = []
+        self._edges = set()
+
+        for title, data in career_database.items():
+            chain = [data.get('entry_level'), title, data.get('senior_level'), data.get('leadership_path')]
+            chain = [role for role in chain if role]
+            for source, target in zip(chain, chain[1:]):
+                self._add_edge(source, target, PROMOTION)
+            for role in data.get('alternative_roles') or []:
+                self._add_edge(title, role, LATERAL)
+                self._add_edge(role, title, LATERAL)
+            self._role_id(title)
+
+        self._reach_cache: 'OrderedDict[int, _Reach]' = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def _role_id(self, title: str) -> int:
+        key = title.strip().casefold()
+        role = self._ids.get(key)
+        if role is None:
+            role = self._ids[key] = len(self.titles)
+            self.titles.append(title.strip())
+            self._adjacency.append([])
+        return role
+
+    def _add_edge(self, source: str, target: str, transition: str):
+        edge = (self._role_id(source), self._role_id(target))
+        if edge[0] != edge[1] and edge not in self._edges:
+            self._edges.add(edge)
+            self._adjacency[edge[0]].append((edge[1], transition))
+
+    def find(self, title: str) -> Optional[str]:
+        """Canonical spelling of a role title (case-insensitive), None if unknown"""
+        role = self._ids.get(title.strip().casefold())
+        return self.titles[role] if role is not None else None
+
+    def _reach(self, source: int) -> _Reach:
+        with self._cache_lock:
+            reach = self._reach_cache.get(source)
+            if reach is not None:
+                self._reach_cache.move_to_end(source)
+                return reach
+
+        distances = [(source, 0)]
+        parents: Dict[int, Tuple[int, str]] = {source: (-1, '')}
+        queue = deque([(source, 0)])
+        while queue:
+            role, hops = queue.popleft()
+            for neighbour, transition in self._adjacency[role]:
+                if neighbour not in parents:
+                    parents[neighbour] = (role, transition)
+                    distances.append((neighbour, hops + 1))
+                    queue.append((neighbour, hops + 1))
+        reach = _Reach(distances, parents)
+
+        with self._cache_lock:
+            self._reach_cache[source] = reach
+            if len(self._reach_cache) > BFS_CACHE_SIZE:
+                self._reach_cache.popitem(last=False)
+        return reach
+
+    def _lookup(self, title: str) -> int:
+        role = self._ids.get(title.strip().casefold())
+        if role is None:
+            raise KeyError(f'Unknown role: {title}')
+        return role
+
+    def shortest_path(self, source: str, target: str) -> Optional[List[Dict[str, str]]]:
+        """Fewest-hop transitions from ``source`` to ``target`` (None if unreachable)"""
+        start, goal = self._lookup(source), self._lookup(target)
+        parents = self._reach(start).parents
+        if goal not in parents:
+            return None
+
+        steps = []
+        role = goal
+        while role != start:
+            parent, transition = parents[role]
+            steps.append({'title': self.titles[role], 'transition': transition})
+            role = parent
+        steps.append({'title': self.titles[start], 'transition': 'start'})
+        return steps[::-1]
+
+    def within(self, title: str, hops: int) -> List[Dict[str, Any]]:
+        """Roles reachable from ``title`` in 1..``hops`` transitions, nearest first"""
+        reach = self._reach(self._lookup(title))
+        roles = []
+        for role, distance in reach.distances[1:]:
+            if distance > hops:
+                break
+            roles.append({'title': self.titles[role], 'hops': distance,
+                          'transition': reach.parents[role][1]})
+        return roles
@@ -0,0 +1,91 @@
+from typing import Dict, List, Any, Iterable
+
+import numpy as np
+import scipy.sparse as sp
+
+
+class CareerSkillIndex:
+    """
+    Skill -> careers posting lists and per-career required-skill bitsets.
+
+    Built once per career-catalog load. Positions follow the iteration order
+    of the career database, so per-career arrays line up with the simulated
+    market factors drawn for the same catalog.
+    """
+
+    def __init__(self, career_database: Dict[str, Dict[str, Any]]):
+        self.titles: List[str] = list(career_database)
+        self.positions = {title: position for position, title in enumerate(self.titles)}
+        self.skill_ids: Dict[str, int] = {}
+        self.required_bits: List[int] = []
+
+        postings: Dict[str, List[int]] = {}
+        for position, data in enumerate(career_database.values()):
+            bits = 0
+            for skill in dict.fromkeys(data['required_skills']):
+                bits |= 1 << self.skill_ids.setdefault(skill, len(self.skill_ids))
+                postings.setdefault(skill, []).append(position)
+            self.required_bits.append(bits)
+        self.postings: Dict[str, np.ndarray] = {
+            skill: np.array(positions, dtype=np.int64) for skill, positions in postings.items()
+        }
+        # Careers x skills incidence matrix, columns numbered by skill_ids
+        rows = np.concatenate([positions for positions in self.postings.values()] or [np.zeros(0, dtype=np.int64)])
+        cols = np.concatenate([np.full(len(positions), self.skill_ids[skill], dtype=np.int64)
+                               for skill, positions in self.postings.items()] or [np.zeros(0, dtype=np.int64)])
+        self.skill_matrix = sp.csr_matrix(
+            (np.ones(len(rows)), (rows, cols)), shape=(len(self.titles), len(self.skill_ids))
+        )
+
+        self.required_counts = np.array(
+            [len(data['required_skills']) for data in career_database.values()], dtype=np.float64
+        )
+        self.growth_rates = np.array(
+            [data.get('growth_rate', 0) for data in career_database.values()], dtype=np.float64
+        )
+        self.industries = sorted({data['industry'] for data in career_database.values()}, key=str)
+        industry_codes = {industry: code for code, industry in enumerate(self.industries)}
+        self.industry_codes = np.array(
+            [industry_codes[data['industry']] for data in career_database.values()], dtype=np.int64
+        )
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def match_counts(self, skills: Iterable[str]) -> np.ndarray:
+        """Required skills of every career found in ``skills`` (repeated profile skills count again)"""
+        counts = np.zeros(len(self.titles), dtype=np.float64)
+        for skill in skills:
+            positions = self.postings.get(skill)
+            if positions is not None:
+                counts[positions] += 1
+        return counts
+
+    def profile_matrix(self, skill_lists: List[List[str]]) -> sp.csr_matrix:
+        """Profiles x skills count matrix (skills outside the catalog are dropped)"""
+        rows, cols = [], []
+        for row, skills in enumerate(skill_lists):
+            for skill in skills:
+                skill_id = self.skill_ids.get(skill)
+                if skill_id is not None:
+                    rows.append(row)
+                    cols.append(skill_id)
+        # Duplicate (row, col) entries are summed, so repeated profile skills count again
+        return sp.csr_matrix(
+            (np.ones(len(rows)), (rows, cols)), shape=(len(skill_lists), len(self.skill_ids))
+        )
+
+    def skill_bits(self, skills: Iterable[str]) -> int:
+        """Bitset of the catalog skills in ``skills``"""
+        bits = 0
+        for skill in skills:
+            skill_id = self.skill_ids.get(skill)
+            if skill_id is not None:
+                bits |= 1 << skill_id
+        return bits
+
+    def missing_skills(self, position: int, required_skills: List[str], skill_bits: int) -> List[str]:
+        """``required_skills`` of the career at ``position`` not covered by ``skill_bits``, in order"""
+        if not self.required_bits[position] & skill_bits:
+            return list(required_skills)
+        return [skill for skill in required_skills if not skill_bits >> self.skill_ids[skill] & 1]
@@ -1,16 +1,117 @@
 import sqlite3
 import json
-from typing import Dict, List, Any
-import random
+import heapq
+import threading
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Set, Tuple
+import numpy as np
+from modules.market_factors import MarketFactorProvider
+from modules.career_index import CareerSkillIndex
+from modules.catalog_version import get_catalog_version
+from modules.salary_index import SalaryIndex, format_salary, DEFAULT_CURRENCY
+from modules.keyword_matcher import KeywordMatcher
+from modules.career_graph import CareerGraph
+
+# Industry-interest mapping
+INDUSTRY_KEYWORDS = {
+    'Technology': ['technology', 'programming', 'software', 'ai', 'data', 'tech'],
+    'Healthcare': ['healthcare', 'health', 'medical', 'science', 'research'],
+    'Finance': ['finance', 'banking', 'business', 'economics', 'money'],
+    'Education': ['education', 'teaching', 'learning', 'academic', 'research']
+}
+
+INDUSTRY_TRENDS = {
+    'Technology': (
+        'AI and Machine Learning integration',
+        'Remote work becoming standard',
+        'Cloud computing adoption',
+        'Cybersecurity focus'
+    ),
+    'Business': (
+        'Data-driven decision making',
+        'Digital transformation',
+        'Agile methodologies',
+        'Customer experience focus'
+    )
+}
+
+def _freeze(value: Any) -> Any:
+    """Read-only copy of a static section: dicts become mapping proxies, lists tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+def _filled(section: MappingProxyType, **fields: Any) -> Dict[str, Any]:
+    """New response dict: a cached section with its per-profile fields set"""
+    block = section.copy()
+    block.update(fields)
+    return block
+
+class CareerState:
+    """
+    One load of the career catalog: the career data and every index built
+    from it (skill postings, salary bands, progression graph) plus the
+    static section cache for those careers.
+
+    A state is built completely before it is published and is never updated
+    piecemeal, so a request that reads one state never mixes two catalogs.
+    """
+    
+    def __init__(self, career_database: Dict[str, Dict[str, Any]], catalog_version: int):
+        self.career_database = career_database
+        self.catalog_version = catalog_version
+        # Parse salary ranges once
+        self.salary_index = SalaryIndex(career_database)
+        self.career_index = CareerSkillIndex(career_database)
+        self.career_graph = CareerGraph(career_database)
+        # Static per-career sections, built lazily for this catalog only
+        self.section_cache: Dict[str, MappingProxyType] = {}
 
 class CareerRecommender:
     def __init__(self):
         self.db_path = 'career_advisor.db'
-        self.career_database = {}
-        self._load_career_data()
+        self.market_factors = MarketFactorProvider()
+        self.interest_matcher = KeywordMatcher(INDUSTRY_KEYWORDS)
+        # Persistent connection used only to poll the catalog version
+        self._version_conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._refresh_lock = threading.Lock()
+        # Current CareerState, replaced by a single assignment on refresh
+        self._state = self._load_career_data(get_catalog_version(self._version_conn))
+    
+    @property
+    def career_database(self) -> Dict[str, Dict[str, Any]]:
+        return self._state.career_database
     
-    def _load_career_data(self):
+    @property
+    def career_index(self) -> CareerSkillIndex:
+        return self._state.career_index
+    
+    @property
+    def salary_index(self) -> SalaryIndex:
+        return self._state.salary_index
+    
+    @property
+    def career_graph(self) -> CareerGraph:
+        return self._state.career_graph
+    
+    @property
+    def catalog_version(self) -> int:
+        return self._state.catalog_version
+    
+    def refresh(self) -> bool:
+        """Reload the careers table if the catalog changed (e.g. after a bulk import)"""
+        with self._refresh_lock:
+            version = get_catalog_version(self._version_conn)
+            if version == self._state.catalog_version:
+                return False
+            self._state = self._load_career_data(version)
+            return True
+    
+    def _load_career_data(self, catalog_version: int) -> CareerState:
         """Load career data from database and add comprehensive career information"""
+        career_database = {}
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
@@ -22,7 +123,7 @@ class CareerRecommender:
         careers = cursor.fetchall()
         
         for career in careers:
-            self.career_database[career[0]] = {
+            career_database[career[0]] = {
                 'title': career[0],
                 'industry': career[1],
                 'required_skills': career[2].split(',') if career[2] else [],
@@ -32,11 +133,12 @@ class CareerRecommender:
             }
         
         # Add comprehensive career data
-        self._add_comprehensive_career_data()
+        self._add_comprehensive_career_data(career_database)
         
         conn.close()
+        return CareerState(career_database, catalog_version)
     
-    def _add_comprehensive_career_data(self):
+    def _add_comprehensive_career_data(self, career_database: Dict[str, Dict]):
         """Add comprehensive career information for better recommendations"""
         comprehensive_careers = {
             'Data Scientist': {
@@ -219,107 +321,237 @@ class CareerRecommender:
         
         # Update career database with comprehensive data
         for title, data in comprehensive_careers.items():
-            if title in self.career_database:
-                self.career_database[title].update(data)
+            if title in career_database:
+                career_database[title].update(data)
             else:
-                self.career_database[title] = data
+                career_database[title] = data
     
     def get_recommendations(self, skill_analysis: Dict, market_analysis: Dict, 
-                          student_data: Dict) -> Dict[str, Any]:
+                          student_data: Dict, include: Optional[Set[str]] = None) -> Dict[str, Any]:
         """
-        Generate personalized career path recommendations
+        Generate personalized career path recommendations.
+        ``include`` limits the optional sections that are built (None builds all).
         """
+        self.refresh()
+        # Every read below goes through this one state, even if a refresh publishes a newer one meanwhile
+        state = self._state
         matched_skills = skill_analysis.get('matched_skills', [])
         skill_names = [skill['name'] for skill in matched_skills]
         interests = student_data.get('interests', [])
         
+        # Each interest is scanned once; every career in an industry reuses the result
+        alignments = self._interest_alignments(interests)
+        
         # Calculate career compatibility scores
-        career_scores = self._calculate_career_scores(skill_names, interests)
+        total_scores, market_factors = self._calculate_career_scores(skill_names, interests, state, alignments)
         
         # Get top recommendations
-        top_careers = sorted(career_scores.items(), key=lambda x: x[1]['score'], reverse=True)[:5]
+        top_careers = self._select_top_careers(total_scores, market_factors, skill_names, interests, 5, state, alignments)
+        
+        recommendations = {
+            'top_careers': [self._format_career_recommendation(career, score, state) 
+                           for career, score in top_careers]
+        }
         
-        # Generate career paths
-        career_paths = self._generate_career_paths(top_careers, skill_analysis, market_analysis)
+        # Optional sections are only built when requested
+        optional_sections = {
+            'career_paths': lambda: self._generate_career_paths(top_careers, skill_analysis, market_analysis, state),
+            'progression_analysis': lambda: self._analyze_career_progression(top_careers, skill_analysis, state),
+            'role_recommendations': lambda: self._generate_role_recommendations(top_careers, skill_analysis, state),
+            'compatibility_summary': lambda: self._generate_compatibility_summary(
+                [round(score, 2) for score in total_scores.tolist()]),
+            'next_steps': lambda: self._generate_next_steps(top_careers, skill_analysis),
+            'detailed_career_analysis': lambda: self._generate_detailed_career_analysis(top_careers, skill_analysis, state),
+            'career_comparison': lambda: self._generate_career_comparison(top_careers[:3], state),
+            'industry_insights': lambda: self._generate_industry_insights(top_careers, market_analysis, state),
+            'skill_roadmap': lambda: self._generate_skill_roadmap(top_careers, skill_analysis)
+        }
+        for section, build in optional_sections.items():
+            if include is None or section in include:
+                recommendations[section] = build()
+        
+        return recommendations
+    
+    def _calculate_career_scores(self, skills: List[str], interests: List[str], state: CareerState,
+                                 alignments: Optional[Dict[str, float]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Unrounded compatibility score of every career, plus the market factors
+        used. The interest and market terms form a prior computed per industry
+        and vectorized over all careers; the skill term is only added for
+        careers found in the posting lists of the profile's skills.
+        """
+        index = state.career_index
+        
+        # Simulated market factors, derived deterministically from the profile
+        market_factors = self.market_factors.uniform(
+            MarketFactorProvider.profile_key(skills, interests), 'career_market',
+            -5, 5, len(index)
+        )
         
-        # Analyze career progression
-        progression_analysis = self._analyze_career_progression(top_careers, skill_analysis)
+        interest_scores = self._interest_by_industry(interests, state, alignments)[index.industry_codes]
+        market_scores = self._market_scores(market_factors, state)
         
-        # Generate role recommendations
-        role_recommendations = self._generate_role_recommendations(top_careers, skill_analysis)
+        # Weighted total score (a zero skill score adds exactly nothing)
+        total_scores = interest_scores * 0.3 + market_scores * 0.2
+        match_counts = index.match_counts(skills)
+        matched = np.flatnonzero(match_counts)
+        skill_scores = (match_counts[matched] / index.required_counts[matched]) * 100
+        total_scores[matched] = skill_scores * 0.5 + interest_scores[matched] * 0.3 + market_scores[matched] * 0.2
         
-        return {
-            'top_careers': [self._format_career_recommendation(career, score) 
-                           for career, score in top_careers],
-            'career_paths': career_paths,
-            'progression_analysis': progression_analysis,
-            'role_recommendations': role_recommendations,
-            'compatibility_summary': self._generate_compatibility_summary(career_scores),
-            'next_steps': self._generate_next_steps(top_careers, skill_analysis),
-            'detailed_career_analysis': self._generate_detailed_career_analysis(top_careers, skill_analysis),
-            'career_comparison': self._generate_career_comparison(top_careers[:3]),
-            'industry_insights': self._generate_industry_insights(top_careers, market_analysis),
-            'skill_roadmap': self._generate_skill_roadmap(top_careers, skill_analysis)
+        return total_scores, market_factors
+    
+    def score_many(self, profiles: List[Dict[str, Any]], top_k: int = 0) -> Dict[str, Any]:
+        """
+        Score every career for many profiles at once.
+        
+        Each profile is a dict with ``skills`` (catalog skill names, as in
+        ``matched_skills``) and ``interests``. Returns profiles x careers
+        matrices of unrounded ``scores``, ``skill_scores``, ``interest_scores``
+        and ``market_scores`` (rows match what ``get_recommendations`` computes
+        for the same profile), the career ``titles`` for the columns and, with
+        ``top_k``, each profile's best careers as ``(title, score)`` pairs.
+        """
+        self.refresh()
+        state = self._state
+        index = state.career_index
+        skill_lists = [list(profile.get('skills') or []) for profile in profiles]
+        interest_lists = [list(profile.get('interests') or []) for profile in profiles]
+        
+        # Profile-skill counts times the career-skill incidence matrix gives the match counts
+        match_counts = (index.profile_matrix(skill_lists) @ index.skill_matrix.T).toarray()
+        has_required = index.required_counts > 0
+        skill_scores = np.zeros_like(match_counts)
+        skill_scores[:, has_required] = (match_counts[:, has_required] / index.required_counts[has_required]) * 100
+        
+        # Cohorts share few distinct interest sets, so align each set once
+        interest_rows: Dict[Tuple[str, ...], np.ndarray] = {}
+        for interests in interest_lists:
+            if tuple(interests) not in interest_rows:
+                interest_rows[tuple(interests)] = self._interest_by_industry(interests, state)
+        interest_scores = np.array(
+            [interest_rows[tuple(interests)] for interests in interest_lists], dtype=np.float64
+        ).reshape(len(profiles), len(index.industries))[:, index.industry_codes]
+        
+        # Simulated market factors, drawn per profile exactly as for a single recommendation
+        market_factors = np.array([
+            self.market_factors.uniform(
+                MarketFactorProvider.profile_key(skills, interests), 'career_market', -5, 5, len(index))
+            for skills, interests in zip(skill_lists, interest_lists)
+        ], dtype=np.float64).reshape(len(profiles), len(index))
+        market_scores = self._market_scores(market_factors, state)
+        
+        # Weighted total score
+        scores = skill_scores * 0.5 + interest_scores * 0.3 + market_scores * 0.2
+        
+        result = {
+            'titles': index.titles,
+            'scores': scores,
+            'skill_scores': skill_scores,
+            'interest_scores': interest_scores,
+            'market_scores': market_scores
         }
+        if top_k:
+            result['top_careers'] = [
+                [(index.titles[position], round(float(row[position]), 2)) for position in self._top_positions(row, top_k)]
+                for row in scores
+            ]
+        return result
+    
+    def _interest_by_industry(self, interests: List[str], state: CareerState,
+                              alignments: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """Interest alignment for each industry of the career index"""
+        if alignments is None:
+            alignments = self._interest_alignments(interests)
+        return np.array(
+            [self._calculate_interest_alignment(industry, interests, alignments)
+             for industry in state.career_index.industries],
+            dtype=np.float64
+        )
     
-    def _calculate_career_scores(self, skills: List[str], interests: List[str]) -> Dict[str, Dict]:
-        """Calculate compatibility scores for each career"""
-        career_scores = {}
+    def _market_scores(self, market_factors: np.ndarray, state: CareerState) -> np.ndarray:
+        """Vectorized ``_calculate_market_score`` over the career index (last axis)"""
+        return np.maximum(0, np.minimum(100, np.minimum(state.career_index.growth_rates * 5, 100) + market_factors))
+    
+    @staticmethod
+    def _top_positions(total_scores: np.ndarray, count: int) -> List[int]:
+        """Positions of the top ``count`` rounded scores; ties keep catalog order, as a stable sort would"""
+        if len(total_scores) > count:
+            # Only careers that can round to at least the count-th best score can place
+            threshold = round(float(np.partition(total_scores, -count)[-count]), 2) - 0.01
+            candidates = np.flatnonzero(total_scores >= threshold).tolist()
+        else:
+            candidates = range(len(total_scores))
+        rounded = {position: round(float(total_scores[position]), 2) for position in candidates}
+        return heapq.nlargest(count, rounded, key=lambda position: (rounded[position], -position))
+    
+    def _select_top_careers(self, total_scores: np.ndarray, market_factors: np.ndarray,
+                            skills: List[str], interests: List[str], count: int, state: CareerState,
+                            alignments: Optional[Dict[str, float]] = None) -> List[Tuple[str, Dict]]:
+        """Top ``count`` careers with their score breakdowns"""
+        index = state.career_index
+        best = self._top_positions(total_scores, count)
         
-        for title, career_data in self.career_database.items():
-            required_skills = career_data['required_skills']
-            
-            # Calculate skill match score
-            skill_matches = len([skill for skill in skills if skill in required_skills])
-            skill_score = (skill_matches / len(required_skills)) * 100 if required_skills else 0
-            
-            # Calculate interest alignment
-            interest_score = self._calculate_interest_alignment(career_data['industry'], interests)
-            
-            # Calculate market opportunity score
-            market_score = self._calculate_market_score(career_data)
-            
-            # Weighted total score
-            total_score = (skill_score * 0.5 + interest_score * 0.3 + market_score * 0.2)
-            
-            career_scores[title] = {
-                'score': round(total_score, 2),
-                'skill_score': round(skill_score, 2),
-                'interest_score': round(interest_score, 2),
-                'market_score': round(market_score, 2),
-                'skill_matches': skill_matches,
-                'total_required': len(required_skills),
-                'missing_skills': [skill for skill in required_skills if skill not in skills]
-            }
+        skill_bits = index.skill_bits(skills)
+        if alignments is None:
+            alignments = self._interest_alignments(interests)
+        return [
+            (index.titles[position],
+             self._score_career(position, skills, skill_bits, interests, market_factors[position], state, alignments))
+            for position in best
+        ]
+    
+    def _score_career(self, position: int, skills: List[str], skill_bits: int,
+                      interests: List[str], market_factor: float, state: CareerState,
+                      alignments: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """Score breakdown of one career"""
+        career_data = state.career_database[state.career_index.titles[position]]
+        required_skills = career_data['required_skills']
+        
+        # Calculate skill match score
+        skill_matches = len([skill for skill in skills if skill in required_skills])
+        skill_score = (skill_matches / len(required_skills)) * 100 if required_skills else 0
+        
+        # Calculate interest alignment
+        interest_score = self._calculate_interest_alignment(career_data['industry'], interests, alignments)
         
-        return career_scores
+        # Calculate market opportunity score
+        market_score = self._calculate_market_score(career_data, market_factor)
+        
+        # Weighted total score
+        total_score = (skill_score * 0.5 + interest_score * 0.3 + market_score * 0.2)
+        
+        return {
+            'score': round(total_score, 2),
+            'skill_score': round(skill_score, 2),
+            'interest_score': round(interest_score, 2),
+            'market_score': round(market_score, 2),
+            'skill_matches': skill_matches,
+            'total_required': len(required_skills),
+            'missing_skills': state.career_index.missing_skills(position, required_skills, skill_bits)
+        }
     
-    def _calculate_interest_alignment(self, industry: str, interests: List[str]) -> float:
+    def _interest_alignments(self, interests: List[str]) -> Dict[str, float]:
+        """Alignment of the interests with every keyworded industry, scanning each interest once"""
+        matches = dict.fromkeys(INDUSTRY_KEYWORDS, 0)
+        for interest in interests:
+            for industry in self.interest_matcher.groups_in(interest):
+                matches[industry] += 1
+        
+        return {industry: (count / len(interests)) * 100 for industry, count in matches.items()} if interests else {}
+    
+    def _calculate_interest_alignment(self, industry: str, interests: List[str],
+                                      alignments: Optional[Dict[str, float]] = None) -> float:
         """Calculate how well career aligns with user interests"""
         if not interests:
             return 50.0  # Neutral score if no interests specified
         
-        # Industry-interest mapping
-        industry_keywords = {
-            'Technology': ['technology', 'programming', 'software', 'ai', 'data', 'tech'],
-            'Healthcare': ['healthcare', 'health', 'medical', 'science', 'research'],
-            'Finance': ['finance', 'banking', 'business', 'economics', 'money'],
-            'Education': ['education', 'teaching', 'learning', 'academic', 'research']
-        }
+        if alignments is None:
+            alignments = self._interest_alignments(interests)
         
-        industry_keywords_list = industry_keywords.get(industry, [])
-        
-        # Check for keyword matches
-        matches = 0
-        for interest in interests:
-            for keyword in industry_keywords_list:
-                if keyword.lower() in interest.lower():
-                    matches += 1
-                    break
-        
-        return (matches / len(interests)) * 100 if interests else 50.0
+        # Industries without keywords match no interest
+        return alignments.get(industry, 0.0)
     
-    def _calculate_market_score(self, career_data: Dict) -> float:
+    def _calculate_market_score(self, career_data: Dict, market_factor: float) -> float:
         """Calculate market opportunity score for career"""
         growth_rate = career_data.get('growth_rate', 0)
         
@@ -327,28 +559,113 @@ class CareerRecommender:
         # Assuming 0-20% growth rate maps to 0-100 score
         market_score = min(growth_rate * 5, 100)
         
-        # Add some randomness to simulate market factors
-        market_score += random.uniform(-5, 5)
+        # Add the simulated market factor
+        market_score += market_factor
         
         return max(0, min(100, market_score))
     
-    def _format_career_recommendation(self, career_title: str, score_data: Dict) -> Dict[str, Any]:
-        """Format career recommendation with all relevant data"""
-        career_data = self.career_database[career_title]
+    def _career_sections(self, career_title: str, state: CareerState) -> MappingProxyType:
+        """
+        Profile-independent sections of a career, built once per catalog load.
+        They are read-only: callers merge them into a new dict per response
+        and copy the nested dicts (``salary_band``, ``skills_breakdown``).
+        """
+        sections = state.section_cache.get(career_title)
+        if sections is None:
+            sections = state.section_cache[career_title] = _freeze(self._build_career_sections(career_title, state))
+        return sections
+    
+    def _build_career_sections(self, career_title: str, state: CareerState) -> Dict[str, Any]:
+        """
+        Static blocks of the per-career responses. Per-profile fields are
+        None placeholders (keeping the key order) filled in by the callers.
+        """
+        career_data = state.career_database[career_title]
         
         return {
-            'title': career_title,
-            'industry': career_data['industry'],
-            'description': career_data['description'],
-            'salary_range': career_data['salary_range'],
-            'growth_rate': career_data['growth_rate'],
-            'compatibility_score': score_data['score'],
-            'skill_match_percentage': round((score_data['skill_matches'] / score_data['total_required']) * 100, 2),
-            'missing_skills': score_data['missing_skills'],
-            'required_skills': career_data['required_skills'],
-            'why_recommended': self._generate_recommendation_reason(score_data, career_data)
+            'recommendation': {
+                'title': career_title,
+                'industry': career_data['industry'],
+                'description': career_data['description'],
+                'salary_range': career_data['salary_range'],
+                'salary_band': self._salary_band(career_title, career_data, state),
+                'growth_rate': career_data['growth_rate'],
+                'compatibility_score': None,
+                'skill_match_percentage': None,
+                'missing_skills': None,
+                'required_skills': career_data['required_skills'],
+                'why_recommended': None
+            },
+            'overview': {
+                'title': career_title,
+                'industry': career_data['industry'],
+                'compatibility_score': None,
+                'description': career_data['description'],
+                'growth_rate': career_data['growth_rate'],
+                'salary_range': career_data['salary_range']
+            },
+            'career_progression': {
+                'entry_level': career_data.get('entry_level', f'Junior {career_title}'),
+                'senior_level': career_data.get('senior_level', f'Senior {career_title}'),
+                'leadership_path': career_data.get('leadership_path', f'{career_title} Manager'),
+                'progression_timeline': career_data.get('career_progression', '2-3 years to Senior level')
+            },
+            'skills_analysis': {
+                'required_skills': career_data['required_skills'],
+                'missing_skills': None,
+                'skill_match_percentage': None,
+                'skills_breakdown': career_data.get('skills_breakdown', {})
+            },
+            'work_environment': {
+                'type': career_data.get('work_environment', 'Office/Remote Hybrid'),
+                'job_satisfaction': career_data.get('job_satisfaction', 4.0),
+                'work_life_balance': career_data.get('work_life_balance', 3.5)
+            },
+            'market_demand': self._assess_market_demand(career_title, career_data),
+            'learning_path': {
+                'foundation_skills': None,
+                'advanced_skills': None,
+                'certifications': career_data.get('certifications', [])[:2],  # Top 2 certifications
+                'learning_timeline': '6-12 months for foundation, 12-18 months for advanced',
+                'recommended_order': [
+                    'Start with foundation skills',
+                    'Build practical projects',
+                    'Earn relevant certifications',
+                    'Develop advanced skills',
+                    'Build portfolio and network'
+                ]
+            },
+            'comparison': {
+                'title': career_title,
+                'compatibility_score': None,
+                'industry': career_data['industry'],
+                'salary_range': career_data['salary_range'],
+                'growth_rate': career_data['growth_rate'],
+                'work_life_balance': career_data.get('work_life_balance', 3.5),
+                'job_satisfaction': career_data.get('job_satisfaction', 4.0)
+            }
         }
     
+    @staticmethod
+    def _skill_match_percentage(score_data: Dict) -> float:
+        return round((score_data['skill_matches'] / score_data['total_required']) * 100, 2)
+    
+    def _format_career_recommendation(self, career_title: str, score_data: Dict, state: CareerState) -> Dict[str, Any]:
+        """Format career recommendation with all relevant data"""
+        career_data = state.career_database[career_title]
+        
+        section = self._career_sections(career_title, state)['recommendation']
+        salary_band = section['salary_band']
+        
+        return _filled(
+            section,
+            salary_band=salary_band.copy() if salary_band is not None else None,
+            compatibility_score=score_data['score'],
+            skill_match_percentage=self._skill_match_percentage(score_data),
+            missing_skills=score_data['missing_skills'],
+            why_recommended=self._generate_recommendation_reason(score_data, career_data)
+        )
+    
     def _generate_recommendation_reason(self, score_data: Dict, career_data: Dict) -> str:
         """Generate explanation for why this career is recommended"""
         reasons = []
@@ -372,12 +689,12 @@ class CareerRecommender:
         return "; ".join(reasons)
     
     def _generate_career_paths(self, top_careers: List, skill_analysis: Dict, 
-                             market_analysis: Dict) -> List[Dict[str, Any]]:
+                             market_analysis: Dict, state: CareerState) -> List[Dict[str, Any]]:
         """Generate career progression paths"""
         paths = []
         
         for career_title, score_data in top_careers[:3]:  # Top 3 careers
-            career_data = self.career_database[career_title]
+            career_data = state.career_database[career_title]
             
             # Generate entry-level to senior progression
             path = {
@@ -389,7 +706,7 @@ class CareerRecommender:
                         'title': f'Junior {career_title}',
                         'timeline': '0-2 years',
                         'required_skills': score_data['missing_skills'][:3],  # Top 3 missing
-                        'salary_estimate': self._estimate_salary(career_data, 0.6),
+                        'salary_estimate': self._estimate_salary(career_data, 0.6, state),
                         'description': f'Entry-level position in {career_data["industry"]}'
                     },
                     {
@@ -397,7 +714,7 @@ class CareerRecommender:
                         'title': career_title,
                         'timeline': '2-5 years',
                         'required_skills': score_data['missing_skills'][:5],
-                        'salary_estimate': self._estimate_salary(career_data, 1.0),
+                        'salary_estimate': self._estimate_salary(career_data, 1.0, state),
                         'description': f'Mid-level {career_title} role with increased responsibilities'
                     },
                     {
@@ -405,7 +722,7 @@ class CareerRecommender:
                         'title': f'Senior {career_title}',
                         'timeline': '5+ years',
                         'required_skills': score_data['missing_skills'],
-                        'salary_estimate': self._estimate_salary(career_data, 1.4),
+                        'salary_estimate': self._estimate_salary(career_data, 1.4, state),
                         'description': f'Senior-level position with leadership responsibilities'
                     }
                 ]
@@ -414,24 +731,54 @@ class CareerRecommender:
         
         return paths
     
-    def _estimate_salary(self, career_data: Dict, multiplier: float) -> str:
+    def _estimate_salary(self, career_data: Dict, multiplier: float, state: CareerState) -> str:
         """Estimate salary based on career data and level multiplier"""
-        # Extract base salary from salary range (simplified)
-        salary_range = career_data.get('salary_range', '₹5,00,000 - ₹8,00,000')
-        
-        # This is a simplified estimation - in reality, you'd parse the range properly
-        base_salary = 650000  # Default base in Indian Rupees
-        estimated = int(base_salary * multiplier)
-        
-        return f'₹{estimated:,}'
+        # Median of the career's parsed salary range
+        band = state.salary_index.band(career_data.get('title'))
+        if band is None:
+            return format_salary(round(650000 * multiplier))  # Default base in Indian Rupees
+        return format_salary(round(band.median * multiplier), band.currency)
+    
+    def _salary_band(self, career_title: str, career_data: Dict, state: CareerState) -> Optional[Dict[str, Any]]:
+        """Numeric salary band and its percentile among careers in the same industry"""
+        band = state.salary_index.band(career_title)
+        if band is None:
+            return None
+        return dict(band._asdict(), industry_percentile=state.salary_index.percentile_of(
+            band.median, career_data.get('industry'), band.currency))
     
-    def _analyze_career_progression(self, top_careers: List, skill_analysis: Dict) -> Dict[str, Any]:
+    def salary_statistics(self, industry: Optional[str] = None, currency: str = DEFAULT_CURRENCY,
+                          salary: Optional[float] = None, percentile: Optional[float] = None,
+                          salary_min: Optional[float] = None, salary_max: Optional[float] = None) -> Dict[str, Any]:
+        """Salary percentile and range queries over the career catalog"""
+        self.refresh()
+        state = self._state
+        index = state.salary_index
+        stats = {'industry': industry, 'summary': index.summary(industry, currency)}
+        if salary is not None:
+            stats['percentile'] = index.percentile_of(salary, industry, currency)
+        if percentile is not None:
+            if not 0 <= percentile <= 100:
+                raise ValueError('percentile must be between 0 and 100')
+            amount = index.salary_at(percentile, industry, currency)
+            stats['salary_at_percentile'] = format_salary(amount, currency) if amount is not None else None
+        if salary_min is not None or salary_max is not None:
+            low = salary_min if salary_min is not None else 0
+            high = salary_max if salary_max is not None else float('inf')
+            stats['careers_in_range'] = [
+                {'title': title, 'salary_range': state.career_database[title]['salary_range']}
+                for title in index.careers_in_range(low, high, industry, currency)
+            ]
+            stats['overlapping_careers'] = index.overlap_count(low, high, industry, currency)
+        return stats
+    
+    def _analyze_career_progression(self, top_careers: List, skill_analysis: Dict, state: CareerState) -> Dict[str, Any]:
         """Analyze career progression opportunities"""
         if not top_careers:
             return {'message': 'No career recommendations available'}
         
         best_career = top_careers[0]
-        career_data = self.career_database[best_career[0]]
+        career_data = state.career_database[best_career[0]]
         
         return {
             'primary_career': best_career[0],
@@ -442,18 +789,38 @@ class CareerRecommender:
                 'priority_skills': best_career[1]['missing_skills'][:5]
             },
             'industry_opportunities': career_data['industry'],
-            'growth_trajectory': f"{career_data['growth_rate']}% annual growth"
+            'growth_trajectory': f"{career_data['growth_rate']}% annual growth",
+            'reachable_roles': state.career_graph.within(best_career[0], 2)
+        }
+    
+    def career_paths(self, source: str, target: Optional[str] = None, hops: int = 2) -> Dict[str, Any]:
+        """Shortest transition path between two roles, or the roles within ``hops`` of ``source``"""
+        self.refresh()
+        graph = self._state.career_graph
+        if graph.find(source) is None:
+            raise ValueError(f'Unknown role: {source}')
+        if target is None:
+            return {'from': graph.find(source), 'hops': hops, 'roles': graph.within(source, hops)}
+        if graph.find(target) is None:
+            raise ValueError(f'Unknown role: {target}')
+        
+        path = graph.shortest_path(source, target)
+        return {
+            'from': graph.find(source),
+            'to': graph.find(target),
+            'path': path,
+            'hops': len(path) - 1 if path else None
         }
     
-    def _generate_role_recommendations(self, top_careers: List, skill_analysis: Dict) -> List[Dict[str, str]]:
+    def _generate_role_recommendations(self, top_careers: List, skill_analysis: Dict, state: CareerState) -> List[Dict[str, str]]:
         """Generate specific role recommendations"""
         roles = []
         
         for career_title, score_data in top_careers[:3]:
-            career_data = self.career_database[career_title]
+            career_data = state.career_database[career_title]
             
             # Generate related roles
-            related_roles = self._get_related_roles(career_title, career_data['industry'])
+            related_roles = self._get_related_roles(career_title, career_data['industry'], state)
             
             for role in related_roles:
                 roles.append({
@@ -466,7 +833,7 @@ class CareerRecommender:
         
         return roles[:6]  # Top 6 roles
     
-    def _get_related_roles(self, career_title: str, industry: str) -> List[Dict[str, Any]]:
+    def _get_related_roles(self, career_title: str, industry: str, state: CareerState) -> List[Dict[str, Any]]:
         """Get related roles for a career"""
         # This would typically come from a more comprehensive database
         related_roles_map = {
@@ -482,17 +849,29 @@ class CareerRecommender:
             ]
         }
         
-        return related_roles_map.get(career_title, [
+        if career_title in related_roles_map:
+            return related_roles_map[career_title]
+        
+        # Otherwise the roles one or two transitions away in the progression graph
+        related_roles = []
+        for role in state.career_graph.within(career_title, 2)[:3]:
+            role_data = state.career_database.get(role['title'], {})
+            related_roles.append({
+                'title': role['title'],
+                'compatibility': 'High' if role['hops'] == 1 else 'Medium',
+                'description': role_data.get('description') or f"{role['transition'].capitalize()} move from {career_title}",
+                'requirements': ', '.join(role_data.get('required_skills', [])[:3]) or 'Similar skills'
+            })
+        
+        return related_roles or [
             {'title': f'Related {career_title}', 'compatibility': 'Medium', 'description': 'Related role in same field', 'requirements': 'Similar skills'}
-        ])
+        ]
     
-    def _generate_compatibility_summary(self, career_scores: Dict) -> Dict[str, Any]:
-        """Generate summary of career compatibility"""
-        if not career_scores:
+    def _generate_compatibility_summary(self, scores: List[float]) -> Dict[str, Any]:
+        """Generate summary of career compatibility from the rounded score of every career"""
+        if not scores:
             return {'message': 'No career data available'}
         
-        scores = [data['score'] for data in career_scores.values()]
-        
         return {
             'average_compatibility': round(sum(scores) / len(scores), 2),
             'highest_score': max(scores),
@@ -520,7 +899,7 @@ class CareerRecommender:
         
         return steps
     
-    def _generate_detailed_career_analysis(self, top_careers: List, skill_analysis: Dict) -> Dict[str, Any]:
+    def _generate_detailed_career_analysis(self, top_careers: List, skill_analysis: Dict, state: CareerState) -> Dict[str, Any]:
         """Generate detailed analysis for top career recommendations"""
         if not top_careers:
             return {'message': 'No career recommendations available'}
@@ -528,43 +907,29 @@ class CareerRecommender:
         detailed_analysis = {}
         
         for career_title, score_data in top_careers[:3]:  # Top 3 careers
-            career_data = self.career_database[career_title]
+            career_data = state.career_database[career_title]
+            sections = self._career_sections(career_title, state)
+            skills_analysis = sections['skills_analysis']
             
             detailed_analysis[career_title] = {
-                'overview': {
-                    'title': career_title,
-                    'industry': career_data['industry'],
-                    'compatibility_score': score_data['score'],
-                    'description': career_data['description'],
-                    'growth_rate': career_data['growth_rate'],
-                    'salary_range': career_data['salary_range']
-                },
-                'career_progression': {
-                    'entry_level': career_data.get('entry_level', f'Junior {career_title}'),
-                    'senior_level': career_data.get('senior_level', f'Senior {career_title}'),
-                    'leadership_path': career_data.get('leadership_path', f'{career_title} Manager'),
-                    'progression_timeline': career_data.get('career_progression', '2-3 years to Senior level')
-                },
-                'skills_analysis': {
-                    'required_skills': career_data['required_skills'],
-                    'missing_skills': score_data['missing_skills'],
-                    'skill_match_percentage': round((score_data['skill_matches'] / score_data['total_required']) * 100, 2),
-                    'skills_breakdown': career_data.get('skills_breakdown', {})
-                },
-                'work_environment': {
-                    'type': career_data.get('work_environment', 'Office/Remote Hybrid'),
-                    'job_satisfaction': career_data.get('job_satisfaction', 4.0),
-                    'work_life_balance': career_data.get('work_life_balance', 3.5)
-                },
+                'overview': _filled(sections['overview'], compatibility_score=score_data['score']),
+                'career_progression': sections['career_progression'].copy(),
+                'skills_analysis': _filled(
+                    skills_analysis,
+                    missing_skills=score_data['missing_skills'],
+                    skill_match_percentage=self._skill_match_percentage(score_data),
+                    skills_breakdown=skills_analysis['skills_breakdown'].copy()
+                ),
+                'work_environment': sections['work_environment'].copy(),
                 'certifications': career_data.get('certifications', []),
                 'alternative_roles': career_data.get('alternative_roles', []),
-                'market_demand': self._assess_market_demand(career_title, career_data),
-                'learning_path': self._generate_learning_path(career_title, score_data['missing_skills'])
+                'market_demand': sections['market_demand'].copy(),
+                'learning_path': self._generate_learning_path(career_title, score_data['missing_skills'], state)
             }
         
         return detailed_analysis
     
-    def _generate_career_comparison(self, top_careers: List) -> Dict[str, Any]:
+    def _generate_career_comparison(self, top_careers: List, state: CareerState) -> Dict[str, Any]:
         """Generate side-by-side comparison of top careers"""
         if len(top_careers) < 2:
             return {'message': 'Need at least 2 careers for comparison'}
@@ -581,33 +946,27 @@ class CareerRecommender:
         }
         
         for career_title, score_data in top_careers:
-            career_data = self.career_database[career_title]
+            career_data = state.career_database[career_title]
+            entry = self._career_sections(career_title, state)['comparison'].copy()
+            entry['compatibility_score'] = score_data['score']
             
-            comparison['careers'].append({
-                'title': career_title,
-                'compatibility_score': score_data['score'],
-                'industry': career_data['industry'],
-                'salary_range': career_data['salary_range'],
-                'growth_rate': career_data['growth_rate'],
-                'work_life_balance': career_data.get('work_life_balance', 3.5),
-                'job_satisfaction': career_data.get('job_satisfaction', 4.0)
-            })
+            comparison['careers'].append(entry)
             
             # Populate comparison matrix
-            comparison['comparison_matrix']['salary'][career_title] = career_data['salary_range']
-            comparison['comparison_matrix']['growth_rate'][career_title] = career_data['growth_rate']
+            comparison['comparison_matrix']['salary'][career_title] = entry['salary_range']
+            comparison['comparison_matrix']['growth_rate'][career_title] = entry['growth_rate']
             comparison['comparison_matrix']['skill_requirements'][career_title] = len(career_data['required_skills'])
-            comparison['comparison_matrix']['work_life_balance'][career_title] = career_data.get('work_life_balance', 3.5)
-            comparison['comparison_matrix']['job_satisfaction'][career_title] = career_data.get('job_satisfaction', 4.0)
+            comparison['comparison_matrix']['work_life_balance'][career_title] = entry['work_life_balance']
+            comparison['comparison_matrix']['job_satisfaction'][career_title] = entry['job_satisfaction']
         
         return comparison
     
-    def _generate_industry_insights(self, top_careers: List, market_analysis: Dict) -> Dict[str, Any]:
+    def _generate_industry_insights(self, top_careers: List, market_analysis: Dict, state: CareerState) -> Dict[str, Any]:
         """Generate industry-specific insights for recommended careers"""
         industries = {}
         
         for career_title, score_data in top_careers:
-            career_data = self.career_database[career_title]
+            career_data = state.career_database[career_title]
             industry = career_data['industry']
             
             if industry not in industries:
@@ -633,22 +992,7 @@ class CareerRecommender:
             )
             
             # Add industry trends
-            if industry == 'Technology':
-                data['key_trends'] = [
-                    'AI and Machine Learning integration',
-                    'Remote work becoming standard',
-                    'Cloud computing adoption',
-                    'Cybersecurity focus'
-                ]
-            elif industry == 'Business':
-                data['key_trends'] = [
-                    'Data-driven decision making',
-                    'Digital transformation',
-                    'Agile methodologies',
-                    'Customer experience focus'
-                ]
-            else:
-                data['key_trends'] = ['Industry growth and innovation']
+            data['key_trends'] = list(INDUSTRY_TRENDS.get(industry, ('Industry growth and innovation',)))
         
         return industries
     
@@ -743,23 +1087,13 @@ class CareerRecommender:
             'job_availability': 'High' if growth_rate >= 10 else 'Medium'
         }
     
-    def _generate_learning_path(self, career_title: str, missing_skills: List[str]) -> Dict[str, Any]:
+    def _generate_learning_path(self, career_title: str, missing_skills: List[str], state: CareerState) -> Dict[str, Any]:
         """Generate learning path for a specific career"""
-        career_data = self.career_database[career_title]
-        
-        return {
-            'foundation_skills': missing_skills[:3],  # Top 3 missing skills
-            'advanced_skills': missing_skills[3:6],  # Next 3 skills
-            'certifications': career_data.get('certifications', [])[:2],  # Top 2 certifications
-            'learning_timeline': '6-12 months for foundation, 12-18 months for advanced',
-            'recommended_order': [
-                'Start with foundation skills',
-                'Build practical projects',
-                'Earn relevant certifications',
-                'Develop advanced skills',
-                'Build portfolio and network'
-            ]
-        }
+        return _filled(
+            self._career_sections(career_title, state)['learning_path'],
+            foundation_skills=missing_skills[:3],  # Top 3 missing skills
+            advanced_skills=missing_skills[3:6]  # Next 3 skills
+        )
     
     def _estimate_skill_learning_time(self, skill: str) -> str:
         """Estimate time required to learn a skill"""
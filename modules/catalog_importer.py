@@ -0,0 +1,242 @@
+"""
+Streaming bulk importer for the skills and careers catalogs.
+
+Records are read lazily from CSV or JSONL and written in fixed-size chunks
+into an unindexed staging table, so memory use does not depend on the size
+of the input. Once everything is staged, the staging index is built in one
+pass and the rows are merged into the catalog with a single set-based upsert
+keyed on the skill name / career title (the last occurrence in the input
+wins). The catalog-version triggers are suspended inside the merge
+transaction and the version is bumped once, instead of once per row.
+
+Command line usage:
+    python -m modules.catalog_importer skills taxonomy.csv
+    python -m modules.catalog_importer careers careers.jsonl --chunk-size 10000
+"""
+import argparse
+import csv
+import json
+import sqlite3
+import sys
+import time
+from typing import Dict, List, Any, Callable, Iterable, Iterator, Optional, Tuple
+
+from modules.catalog_version import (
+    ensure_catalog_version_tracking, create_catalog_triggers, trigger_name, TRIGGER_EVENTS
+)
+
+
+def _skill_row(record: Dict[str, Any]) -> Tuple:
+    name = (record.get('name') or '').strip()
+    if not name:
+        raise ValueError('Skill name is required')
+    return (name, (record.get('category') or 'Technical').strip(), (record.get('description') or '').strip())
+
+
+def _career_row(record: Dict[str, Any]) -> Tuple:
+    title = (record.get('title') or '').strip()
+    if not title:
+        raise ValueError('Career title is required')
+    required_skills = record.get('required_skills') or ''
+    if isinstance(required_skills, list):
+        required_skills = ','.join(skill.strip() for skill in required_skills)
+    growth_rate = record.get('growth_rate')
+    return (
+        title,
+        (record.get('industry') or '').strip(),
+        required_skills,
+        (record.get('salary_range') or '').strip(),
+        float(growth_rate) if growth_rate not in (None, '') else None,
+        (record.get('description') or '').strip()
+    )
+
+
+# table -> (dedupe key, columns in insert order, record -> row converter)
+CATALOG_SPECS: Dict[str, Tuple[str, Tuple[str, ...], Callable[[Dict[str, Any]], Tuple]]] = {
+    'skills': ('name', ('name', 'category', 'description'), _skill_row),
+    'careers': ('title', ('title', 'industry', 'required_skills', 'salary_range', 'growth_rate', 'description'),
+                _career_row)
+}
+
+
+def ensure_unique_career_titles(conn: sqlite3.Connection):
+    """
+    Collapse duplicate career titles (keeping the first row) and add the
+    unique index that lets ``INSERT OR IGNORE`` and the importer dedupe on title.
+    """
+    has_index = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_careers_title'"
+    ).fetchone()
+    if has_index:
+        return
+    conn.execute('DELETE FROM careers WHERE id NOT IN (SELECT MIN(id) FROM careers GROUP BY title)')
+    conn.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_careers_title ON careers (title)')
+    conn.commit()
+
+
+def iter_records(lines: Iterable[str], fmt: str) -> Iterator[Optional[Dict[str, Any]]]:
+    """Yield records from CSV or JSONL lines; unparsable JSONL lines yield None"""
+    if fmt == 'csv':
+        yield from csv.DictReader(lines)
+        return
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            record = None
+        yield record if isinstance(record, dict) else None
+
+
+def detect_format(path: str) -> str:
+    return 'csv' if path.lower().endswith('.csv') else 'jsonl'
+
+
+class CatalogImporter:
+    """Chunked, deduplicating importer into the ``skills`` / ``careers`` tables"""
+
+    def __init__(self, db_path: str = 'career_advisor.db', chunk_size: int = 5000):
+        self.db_path = db_path
+        self.chunk_size = chunk_size
+
+    def import_records(self, table: str, records: Iterable[Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Stage, dedupe and merge ``records`` into ``table``; returns import counters"""
+        if table not in CATALOG_SPECS:
+            raise ValueError(f"Unknown catalog table: {table}")
+        key, columns, to_row = CATALOG_SPECS[table]
+        staging = f'{table}_import'
+        started = time.perf_counter()
+        stats = {'read': 0, 'skipped': 0}
+
+        conn = self._connect(table)
+        try:
+            conn.execute(f'DROP TABLE IF EXISTS temp.{staging}')
+            conn.execute(f'CREATE TEMP TABLE {staging} (seq INTEGER PRIMARY KEY, {", ".join(columns)})')
+            insert_sql = f'INSERT INTO {staging} ({", ".join(columns)}) VALUES ({", ".join("?" * len(columns))})'
+
+            chunk: List[Tuple] = []
+            for record in records:
+                stats['read'] += 1
+                try:
+                    chunk.append(to_row(record))
+                except (AttributeError, TypeError, ValueError):
+                    stats['skipped'] += 1
+                    continue
+                if len(chunk) >= self.chunk_size:
+                    self._write_chunk(conn, insert_sql, chunk)
+                    chunk = []
+            self._write_chunk(conn, insert_sql, chunk)
+
+            # Deferred index build: one sort over the staged rows instead of per-insert maintenance
+            conn.execute(f'CREATE INDEX temp.{staging}_key ON {staging} ({key}, seq)')
+            stats.update(self._merge(conn, table, staging, key, columns))
+        finally:
+            conn.execute(f'DROP TABLE IF EXISTS temp.{staging}')
+            conn.close()
+
+        stats['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        return stats
+
+    def import_file(self, table: str, path: str, fmt: Optional[str] = None) -> Dict[str, Any]:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            return self.import_records(table, iter_records(f, fmt or detect_format(path)))
+
+    def _connect(self, table: str) -> sqlite3.Connection:
+        # Autocommit mode; transactions are managed explicitly below
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=FILE')
+        ensure_catalog_version_tracking(conn)
+        if table == 'careers':
+            ensure_unique_career_titles(conn)
+        return conn
+
+    @staticmethod
+    def _write_chunk(conn: sqlite3.Connection, insert_sql: str, chunk: List[Tuple]):
+        if not chunk:
+            return
+        conn.execute('BEGIN')
+        conn.executemany(insert_sql, chunk)
+        conn.execute('COMMIT')
+
+    @staticmethod
+    def _merge(conn: sqlite3.Connection, table: str, staging: str, key: str,
+               columns: Tuple[str, ...]) -> Dict[str, int]:
+        column_list = ', '.join(columns)
+        updates = [column for column in columns if column != key]
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            unique = conn.execute(f'SELECT COUNT(DISTINCT {key}) FROM {staging}').fetchone()[0]
+            existing = conn.execute(
+                f'SELECT COUNT(*) FROM (SELECT DISTINCT {key} FROM {staging}) AS s '
+                f'JOIN {table} AS t ON t.{key} = s.{key}'
+            ).fetchone()[0]
+
+            # Bump the catalog version once for the whole import
+            for event in TRIGGER_EVENTS:
+                conn.execute(f'DROP TRIGGER IF EXISTS {trigger_name(table, event)}')
+
+            before = conn.total_changes
+            conn.execute(f'''
+                INSERT INTO {table} ({column_list})
+                SELECT {column_list} FROM {staging}
+                WHERE seq IN (SELECT MAX(seq) FROM {staging} GROUP BY {key})
+                ORDER BY seq
+                ON CONFLICT ({key}) DO UPDATE SET
+                    {", ".join(f"{column} = excluded.{column}" for column in updates)}
+                WHERE ({", ".join(updates)}) IS NOT ({", ".join(f"excluded.{column}" for column in updates)})
+            ''')
+            changed = conn.total_changes - before
+            if changed:
+                conn.execute('UPDATE catalog_version SET version = version + 1 WHERE id = 1')
+
+            create_catalog_triggers(conn.cursor(), (table,))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+        inserted = unique - existing
+        return {
+            'unique': unique,
+            'inserted': inserted,
+            'updated': changed - inserted,
+            'unchanged': existing - (changed - inserted)
+        }
+
+
+def warm_skill_artifact(db_path: str = 'career_advisor.db'):
+    """Fit and persist the skill vector artifact so app workers can memory-map it on reload"""
+    from modules.skill_mapping import SkillMappingEngine
+    SkillMappingEngine(db_path=db_path)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Bulk import skills or careers from CSV or JSONL')
+    parser.add_argument('table', choices=sorted(CATALOG_SPECS), help='Catalog table to import into')
+    parser.add_argument('input', help="CSV or JSONL file ('-' for stdin)")
+    parser.add_argument('--format', choices=('csv', 'jsonl'), default=None,
+                        help='Input format (default: from the file extension, JSONL for stdin)')
+    parser.add_argument('--db', default='career_advisor.db', help='SQLite database path')
+    parser.add_argument('--chunk-size', type=int, default=5000, help='Rows per staging transaction')
+    parser.add_argument('--no-rebuild', action='store_true', help='Skip rebuilding the skill vector artifact')
+    args = parser.parse_args(argv)
+
+    importer = CatalogImporter(args.db, chunk_size=args.chunk_size)
+    if args.input == '-':
+        stats = importer.import_records(args.table, iter_records(sys.stdin, args.format or 'jsonl'))
+    else:
+        stats = importer.import_file(args.table, args.input, args.format)
+
+    if args.table == 'skills' and not args.no_rebuild and stats['inserted'] + stats['updated']:
+        warm_skill_artifact(args.db)
+    # Running app processes pick up the new catalog version on their next request
+    print(json.dumps(stats))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,51 @@
+import sqlite3
+
+# Tables whose changes invalidate anything derived from the skill/career catalog
+CATALOG_TABLES = ('skills', 'careers', 'skill_aliases')
+TRIGGER_EVENTS = ('INSERT', 'UPDATE', 'DELETE')
+
+
+def ensure_catalog_version_tracking(conn: sqlite3.Connection):
+    """
+    Create the ``catalog_version`` counter row and the triggers that bump it
+    whenever a row in one of ``CATALOG_TABLES`` is inserted, updated or deleted.
+    """
+    cursor = conn.cursor()
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS catalog_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
+        )
+    ''')
+    cursor.execute('INSERT OR IGNORE INTO catalog_version (id, version) VALUES (1, 0)')
+    create_catalog_triggers(cursor)
+    conn.commit()
+
+
+def create_catalog_triggers(cursor: sqlite3.Cursor, tables=CATALOG_TABLES):
+    """Create the version-bumping triggers for those of ``tables`` that exist (no commit)"""
+    existing = {row[0] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    for table in tables:
+        if table not in existing:
+            continue
+        for event in TRIGGER_EVENTS:
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {trigger_name(table, event)}
+                AFTER {event} ON {table}
+                BEGIN
+                    UPDATE catalog_version SET version = version + 1 WHERE id = 1;
+                END
+            ''')
+
+
+def trigger_name(table: str, event: str) -> str:
+    return f'{table}_{event.lower()}_bump_catalog_version'
+
+
+def get_catalog_version(conn: sqlite3.Connection) -> int:
+    """Current catalog version (0 if tracking has not been set up)"""
+    try:
+        row = conn.execute('SELECT version FROM catalog_version WHERE id = 1').fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return row[0] if row else 0
@@ -0,0 +1,142 @@
+import argparse
+import random
+import sqlite3
+import sys
+import threading
+from typing import Dict, List, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+
+class HashedTfidfView:
+    """
+    Frozen TF-IDF transform over hashed term counts.
+
+    Uses the same tokenization, smoothed IDF and L2 normalization as
+    ``TfidfVectorizer``, and drops terms that occur in no catalog document
+    (their IDF is 0) the way ``TfidfVectorizer`` ignores out-of-vocabulary
+    words, so apart from (rare) hash collisions the vectors match a full
+    refit on the same catalog.
+    """
+
+    def __init__(self, hasher: HashingVectorizer, idf: np.ndarray):
+        self.hasher = hasher
+        self.idf = idf
+
+    def transform(self, documents: List[str]) -> sp.csr_matrix:
+        counts = self.hasher.transform(documents).tocsr()
+        counts.data = counts.data * self.idf[counts.indices]
+        counts.eliminate_zeros()
+        return normalize(counts)
+
+
+class IncrementalSkillVectorizer:
+    """
+    TF-IDF model that absorbs skill additions, edits and deletions without
+    refitting the whole catalog.
+
+    Raw term counts come from a stateless ``HashingVectorizer`` and are kept
+    per skill together with a document-frequency table, so a change only
+    tokenizes the affected skills. IDF weights and the normalized matrix are
+    recomputed with vectorized NumPy operations.
+    """
+
+    def __init__(self, n_features: int = 2 ** 20):
+        self.hasher = HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None)
+        self.doc_freq = np.zeros(n_features, dtype=np.int64)
+        self._documents: Dict[str, str] = {}
+        self._rows: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}  # name -> (term indices, counts)
+        self._lock = threading.Lock()
+
+    def sync(self, names: List[str], documents: List[str]) -> Tuple[HashedTfidfView, sp.csr_matrix]:
+        """
+        Bring the model in line with the given catalog and return a frozen
+        transform plus the normalized skill matrix with rows in ``names`` order.
+        """
+        with self._lock:
+            current = dict(zip(names, documents))
+            for name in [n for n in self._documents if n not in current]:
+                self._remove(name)
+            changed = [name for name, document in current.items() if self._documents.get(name) != document]
+            if changed:
+                self._upsert(changed, [current[name] for name in changed])
+
+            idf = np.log((1 + len(self._rows)) / (1 + self.doc_freq)) + 1.0
+            # Terms outside the catalog are out of vocabulary, not maximally rare
+            idf[self.doc_freq == 0] = 0.0
+            return HashedTfidfView(self.hasher, idf), self._matrix(names, idf)
+
+    def _upsert(self, names: List[str], documents: List[str]):
+        for name in names:
+            if name in self._rows:
+                self._remove(name)
+        # One hashing pass over all changed documents
+        counts = self.hasher.transform(documents).tocsr()
+        counts.sort_indices()
+        for i, (name, document) in enumerate(zip(names, documents)):
+            start, end = counts.indptr[i], counts.indptr[i + 1]
+            self._rows[name] = (counts.indices[start:end], counts.data[start:end])
+            self._documents[name] = document
+        np.add.at(self.doc_freq, counts.indices, 1)
+
+    def _remove(self, name: str):
+        indices, _ = self._rows.pop(name)
+        del self._documents[name]
+        self.doc_freq[indices] -= 1
+
+    def _matrix(self, names: List[str], idf: np.ndarray) -> sp.csr_matrix:
+        rows = [self._rows[name] for name in names]
+        lengths = np.fromiter((len(indices) for indices, _ in rows), dtype=np.int64, count=len(rows))
+        indptr = np.concatenate(([0], np.cumsum(lengths)))
+        indices = np.concatenate([r[0] for r in rows]) if rows else np.zeros(0, dtype=np.int32)
+        data = np.concatenate([r[1] for r in rows]) if rows else np.zeros(0)
+        matrix = sp.csr_matrix((data * idf[indices], indices, indptr),
+                               shape=(len(rows), len(self.doc_freq)))
+        return normalize(matrix)
+
+
+def compare_with_refit(documents: List[str], queries: List[str]) -> float:
+    """
+    Largest absolute difference between the query-to-skill cosine scores of
+    the incremental model and of a ``TfidfVectorizer`` fitted on ``documents``.
+    """
+    names = [str(i) for i in range(len(documents))]
+    view, matrix = IncrementalSkillVectorizer().sync(names, documents)
+    refit = TfidfVectorizer()
+    refit_matrix = refit.fit_transform(documents)
+
+    incremental_scores = (view.transform(queries) @ matrix.T).toarray()
+    refit_scores = (refit.transform(queries) @ refit_matrix.T).toarray()
+    return float(np.abs(incremental_scores - refit_scores).max()) if queries else 0.0
+
+
+def main(argv=None):
+    """Check the incremental model against a full refit on the skills table"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--db', default='career_advisor.db')
+    parser.add_argument('--queries', type=int, default=300)
+    parser.add_argument('--tolerance', type=float, default=1e-9)
+    args = parser.parse_args(argv)
+
+    conn = sqlite3.connect(args.db)
+    documents = [f'{name} {description}' for name, description in
+                 conn.execute('SELECT name, description FROM skills ORDER BY category, name')]
+    conn.close()
+
+    # Random profiles mixing catalog words with words no skill mentions
+    rng = random.Random(0)
+    words = sorted({word for document in documents for word in document.split()})
+    unknown = ['logic', 'gardening', 'poetry', 'sailing', 'xyzzy']
+    queries = [' '.join(rng.sample(words, rng.randint(1, 4)) + rng.sample(unknown, rng.randint(0, 2)))
+               for _ in range(args.queries)]
+
+    difference = compare_with_refit(documents, queries)
+    print(f'max score difference over {len(queries)} queries: {difference:.3g}')
+    return 0 if difference <= args.tolerance else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,551 @@
+"""
+Job-postings ingestion.
+
+Scans a directory for JSONL/CSV job-posting dumps, extracts catalog skills
+from each posting on a process pool and folds the results into per-industry
+and per-skill demand aggregates in SQLite. Files are streamed in fixed-size
+batches with a bounded number in flight, so memory does not depend on file
+size. Each batch's aggregates are committed together with the file's
+progress, so an interrupted run resumes where it stopped and files may keep
+growing between runs. At the end of a run the aggregates are materialized
+into a versioned market snapshot, which ``JobMarketAnalyzer`` loads.
+
+Reposts and cross-posted copies of the same posting are dropped before they
+reach the aggregates: every posting gets a 64-bit simhash of its title and
+description, split into four 16-bit bands stored in SQLite. Two fingerprints
+within ``DUPLICATE_DISTANCE`` bits share at least one band, so a posting is
+compared only against the few fingerprints found by four indexed lookups.
+
+Accepted postings are also counted per day, week and month (by their
+``posted_at`` date, or the ingestion date) for every skill and industry.
+Trending and declining skills are a range query over these rollups that
+compares the latest complete periods with the ones before them.
+
+Posting fields: ``title``, ``description``, ``industry`` and optionally
+``skills`` (list or comma-separated) and ``posted_at`` (ISO date or epoch
+seconds).
+
+Command line usage:
+    python -m modules.job_ingestion postings/ --workers 4
+    python -m modules.job_ingestion postings/ --watch 300
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import sqlite3
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+
+import numpy as np
+
+from modules.catalog_importer import iter_records, detect_format
+from modules.skill_catalog import SkillCatalog
+from modules.skill_normalizer import SkillNormalizer, normalize_key
+
+# Number of most-demanded skills published per industry in the snapshot
+TOP_DEMAND_SKILLS = 6
+
+# Simhash layout: 64-bit fingerprints, banded for lookup
+FINGERPRINT_BANDS = 4
+BAND_BITS = 16
+# Postings whose fingerprints differ in at most this many bits are duplicates
+DUPLICATE_DISTANCE = FINGERPRINT_BANDS - 1
+
+ROLLUP_GRANULARITIES = ('day', 'week', 'month')
+# Trend queries compare the last TREND_PERIODS complete weeks with the TREND_PERIODS before them
+TREND_GRANULARITY = 'week'
+TREND_PERIODS = 4
+# Skills need this many postings across both windows to be ranked
+TREND_MIN_POSTINGS = 20
+# Growth ratios within this distance of 1 count as stable, not trending or declining
+TREND_DEAD_BAND = 0.1
+# Trending / declining skills published in the snapshot
+TREND_LIMIT = 10
+
+_PUNCTUATION = '.,;:!?()[]{}"\''
+_DIGITS = re.compile(r'\d+')
+
+# Per-process phrase table, set by _init_worker
+_worker_phrases: Dict[str, str] = {}
+_worker_max_words = 1
+
+
+def ensure_ingestion_tables(conn: sqlite3.Connection):
+    conn.executescript('''
+        CREATE TABLE IF NOT EXISTS ingested_files (
+            path TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            records_done INTEGER NOT NULL DEFAULT 0,
+            duplicates INTEGER NOT NULL DEFAULT 0,
+            updated_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS industry_demand (
+            industry TEXT PRIMARY KEY,
+            postings INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS skill_demand (
+            industry TEXT NOT NULL,
+            skill TEXT NOT NULL,
+            postings INTEGER NOT NULL,
+            PRIMARY KEY (industry, skill)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS market_snapshots (
+            version INTEGER PRIMARY KEY,
+            created_at REAL NOT NULL,
+            payload TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS posting_fingerprints (
+            band INTEGER NOT NULL,
+            value INTEGER NOT NULL,
+            fingerprint INTEGER NOT NULL,
+            PRIMARY KEY (band, value, fingerprint)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS skill_rollups (
+            granularity TEXT NOT NULL,
+            period TEXT NOT NULL,
+            skill TEXT NOT NULL,
+            postings INTEGER NOT NULL,
+            PRIMARY KEY (granularity, period, skill)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS industry_rollups (
+            granularity TEXT NOT NULL,
+            period TEXT NOT NULL,
+            industry TEXT NOT NULL,
+            postings INTEGER NOT NULL,
+            PRIMARY KEY (granularity, period, industry)
+        ) WITHOUT ROWID;
+    ''')
+    columns = {row[1] for row in conn.execute('PRAGMA table_info(ingested_files)')}
+    if 'duplicates' not in columns:
+        conn.execute('ALTER TABLE ingested_files ADD COLUMN duplicates INTEGER NOT NULL DEFAULT 0')
+    conn.commit()
+
+
+def get_market_snapshot_version(conn: sqlite3.Connection) -> int:
+    """Version of the latest materialized market snapshot (0 if there is none)"""
+    try:
+        row = conn.execute('SELECT MAX(version) FROM market_snapshots').fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return row[0] or 0
+
+
+def load_market_snapshot(conn: sqlite3.Connection) -> Tuple[int, Dict[str, Any]]:
+    """Latest materialized snapshot as ``(version, payload)``; ``(0, {})`` if there is none"""
+    try:
+        row = conn.execute('SELECT version, payload FROM market_snapshots ORDER BY version DESC LIMIT 1').fetchone()
+    except sqlite3.OperationalError:
+        return 0, {}
+    return (row[0], json.loads(row[1])) if row else (0, {})
+
+
+def period_start(day: date, granularity: str) -> date:
+    """First day of the day/week/month period containing ``day`` (weeks start on Monday)"""
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    if granularity == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def shift_period(start: date, granularity: str, periods: int) -> date:
+    """Start of the period ``periods`` periods after the one starting at ``start``"""
+    if granularity == 'week':
+        return start + timedelta(weeks=periods)
+    if granularity == 'month':
+        month = start.year * 12 + start.month - 1 + periods
+        return date(month // 12, month % 12 + 1, 1)
+    return start + timedelta(days=periods)
+
+
+def demand_trends(conn: sqlite3.Connection, dimension: str = 'skill', granularity: str = TREND_GRANULARITY,
+                  periods: int = TREND_PERIODS, min_postings: int = TREND_MIN_POSTINGS) -> Dict[str, Any]:
+    """
+    Posting growth per skill or industry: the last ``periods`` complete
+    periods against the ``periods`` before them, read from the rollups.
+    ``growth_ratio`` is add-one smoothed, so keys new to the window rank high
+    without dividing by zero.
+    """
+    table = {'skill': 'skill_rollups', 'industry': 'industry_rollups'}[dimension]
+    latest = conn.execute(f"SELECT MAX(period) FROM {table} WHERE granularity = 'day'").fetchone()[0]
+    if latest is None:
+        return {}
+    latest = date.fromisoformat(latest)
+    end = period_start(latest, granularity)
+    if shift_period(end, granularity, 1) - timedelta(days=1) != latest:
+        # The latest period is still filling up; comparing it would understate growth
+        end = shift_period(end, granularity, -1)
+    current = shift_period(end, granularity, 1 - periods)
+    previous = shift_period(current, granularity, -periods)
+
+    growth = {}
+    for key, recent, before in conn.execute(f'''
+        SELECT {dimension},
+               SUM(CASE WHEN period >= :current THEN postings ELSE 0 END),
+               SUM(CASE WHEN period < :current THEN postings ELSE 0 END)
+        FROM {table}
+        WHERE granularity = :granularity AND period >= :previous AND period <= :end
+        GROUP BY {dimension}
+    ''', {'granularity': granularity, 'previous': previous.isoformat(),
+          'current': current.isoformat(), 'end': end.isoformat()}):
+        if recent + before >= min_postings:
+            growth[key] = {
+                'recent': recent,
+                'previous': before,
+                'growth_ratio': round((recent + 1) / (before + 1), 4)
+            }
+    return {
+        'granularity': granularity,
+        'periods': periods,
+        'from': previous.isoformat(),
+        'through': (shift_period(end, granularity, 1) - timedelta(days=1)).isoformat(),
+        'growth': growth
+    }
+
+
+def rank_trends(trends: Dict[str, Any], limit: int = TREND_LIMIT) -> Dict[str, Any]:
+    """Strongest risers and fallers of a ``demand_trends`` result"""
+    growth = trends.get('growth', {})
+    movers = [dict(stats, skill=key) for key, stats in growth.items()]
+    rising = sorted((m for m in movers if m['growth_ratio'] >= 1 + TREND_DEAD_BAND),
+                    key=lambda m: (-m['growth_ratio'], -m['recent'], m['skill']))
+    falling = sorted((m for m in movers if m['growth_ratio'] <= 1 - TREND_DEAD_BAND),
+                     key=lambda m: (m['growth_ratio'], -m['previous'], m['skill']))
+    ranked = {key: value for key, value in trends.items() if key != 'growth'}
+    ranked.update(ranked=len(movers), trending=rising[:limit], declining=falling[:limit])
+    return ranked
+
+
+def _posted_on(record: Dict[str, Any]) -> Optional[str]:
+    """ISO date a posting was published, if it carries a usable one"""
+    value = record.get('posted_at') or record.get('date_posted')
+    try:
+        if isinstance(value, str) and not value.strip().isdigit():
+            return date.fromisoformat(value.strip()[:10]).isoformat()
+        if value is not None:
+            return datetime.fromtimestamp(float(value), timezone.utc).date().isoformat()
+    except (ValueError, TypeError, OverflowError, OSError):
+        pass
+    return None
+
+
+def extract_skills(text: str, phrases: Dict[str, str], max_words: int) -> List[str]:
+    """Catalog skills mentioned in ``text`` (longest name/alias match first)"""
+    tokens = [token.strip(_PUNCTUATION) for token in text.casefold().split()]
+    tokens = [token for token in tokens if token]
+    found = []
+    i = 0
+    while i < len(tokens):
+        for n in range(min(max_words, len(tokens) - i), 0, -1):
+            name = phrases.get(' '.join(tokens[i:i + n]))
+            if name is not None:
+                found.append(name)
+                i += n
+                break
+        else:
+            i += 1
+    return found
+
+
+@lru_cache(maxsize=1 << 16)
+def _token_hash(token: str) -> bytes:
+    return hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest()
+
+
+def simhash(text: str) -> Optional[int]:
+    """64-bit simhash over term-frequency weighted words of ``text``; None if there are none"""
+    # Digits are collapsed so reposts with new dates or reference numbers still match
+    counts = Counter([token.strip(_PUNCTUATION) for token in _DIGITS.sub('0', text.casefold()).split()])
+    counts.pop('', None)
+    if not counts:
+        return None
+    hashes = np.frombuffer(b''.join(map(_token_hash, counts)), dtype=np.uint8)
+    bits = np.unpackbits(hashes).reshape(len(counts), 64)
+    weights = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+    # Each word votes +weight/-weight per bit; the fingerprint keeps the bits with a positive total
+    votes = weights @ bits
+    return int.from_bytes(np.packbits(votes * 2 > weights.sum()).tobytes(), 'big')
+
+
+def fingerprint_bands(fingerprint: int) -> List[int]:
+    mask = (1 << BAND_BITS) - 1
+    return [(fingerprint >> (band * BAND_BITS)) & mask for band in range(FINGERPRINT_BANDS)]
+
+
+def _to_signed(fingerprint: int) -> int:
+    # SQLite integers are signed 64-bit
+    return fingerprint - (1 << 64) if fingerprint >= 1 << 63 else fingerprint
+
+
+def _init_worker(phrases: Dict[str, str]):
+    global _worker_phrases, _worker_max_words
+    _worker_phrases = phrases
+    _worker_max_words = max((len(key.split(' ')) for key in phrases), default=1)
+
+
+def _extract_posting(record: Any) -> Optional[Tuple[str, Tuple[str, ...], Optional[int], Optional[str]]]:
+    """``(industry, skills, fingerprint, posted_on)`` for one posting, or None if it is unusable"""
+    if not isinstance(record, dict):
+        return None
+    industry = normalize_key(record.get('industry') or '') or 'other'
+    text = f"{record.get('title') or ''} {record.get('description') or ''}"
+    skills = set(extract_skills(text, _worker_phrases, _worker_max_words))
+
+    listed = record.get('skills') or []
+    if isinstance(listed, str):
+        listed = listed.split(',')
+    for skill in listed:
+        name = _worker_phrases.get(normalize_key(skill))
+        if name is not None:
+            skills.add(name)
+    return industry, tuple(sorted(skills)), simhash(text), _posted_on(record)
+
+
+def _extract_batch(records: List[Any]) -> List[Optional[Tuple[str, Tuple[str, ...], Optional[int], Optional[str]]]]:
+    return [_extract_posting(record) for record in records]
+
+
+class JobPostingIngestor:
+    """Streams posting files through a process pool into SQLite demand aggregates"""
+
+    def __init__(self, db_path: str = 'career_advisor.db', workers: Optional[int] = None,
+                 batch_size: int = 1000, max_in_flight: Optional[int] = None):
+        self.db_path = db_path
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight or self.workers * 2
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        ensure_ingestion_tables(self.conn)
+        self.normalizer = SkillNormalizer(SkillCatalog(db_path))
+        self.executor = None
+        # Catalog snapshot whose phrase table the current pool's workers hold
+        self._pool_snapshot = None
+
+    def ingest_directory(self, directory: str) -> Dict[str, Any]:
+        """Ingest every new or grown ``.jsonl``/``.csv`` file and refresh the snapshot"""
+        stats = Counter()
+        for name in sorted(os.listdir(directory)):
+            path = os.path.join(directory, name)
+            if os.path.isfile(path) and name.lower().endswith(('.jsonl', '.csv')):
+                file_stats = self.ingest_file(path)
+                stats.update(file_stats)
+                stats['files'] += 1 if any(file_stats.values()) else 0
+        result = dict(stats)
+        result['duplicates_total'] = self.duplicate_count()
+        if stats['postings']:
+            result['snapshot_version'] = self.materialize_snapshot()
+        return result
+
+    def ingest_file(self, path: str) -> Dict[str, int]:
+        """Ingest the records of ``path`` that have not been processed yet"""
+        path = os.path.abspath(path)
+        size = os.path.getsize(path)
+        row = self.conn.execute('SELECT size, records_done FROM ingested_files WHERE path = ?', (path,)).fetchone()
+        # Files are treated as append-only; a shrunken file is taken as a new file
+        records_done = row[1] if row and size >= row[0] else 0
+        stats = Counter(postings=0, skipped=0, duplicates=0)
+        if row and size == row[0]:
+            return dict(stats)
+
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            records = islice(iter_records(f, detect_format(path)), records_done, None)
+            for end, results in self._extract(records, records_done):
+                self._apply(path, end, results, stats)
+        self.conn.execute(
+            'INSERT INTO ingested_files (path, size, records_done, updated_at) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT (path) DO UPDATE SET size = excluded.size, records_done = excluded.records_done, '
+            'updated_at = excluded.updated_at',
+            (path, size, records_done + stats['postings'] + stats['skipped'] + stats['duplicates'], time.time())
+        )
+        self.conn.commit()
+        return dict(stats)
+
+    def _extract(self, records: Iterator[Any], start: int) -> Iterator[Tuple[int, List]]:
+        """
+        Yield ``(records consumed so far, extracted postings)`` per batch, in
+        input order. The catalog is checked once per file, so skill and alias
+        edits reach the workers from the next file on.
+        """
+        snapshot = self.normalizer.catalog.current()
+        if self.executor is not None and snapshot is not self._pool_snapshot:
+            # Skills or aliases changed (catalog_version moved): restart the workers with the new table
+            self.executor.shutdown()
+            self.executor = None
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(self.normalizer.phrase_table(),)
+            )
+            self._pool_snapshot = snapshot
+        in_flight = deque()
+        end = start
+        while True:
+            batch = list(islice(records, self.batch_size))
+            if not batch:
+                break
+            end += len(batch)
+            in_flight.append((end, self.executor.submit(_extract_batch, batch)))
+            if len(in_flight) >= self.max_in_flight:
+                done_end, future = in_flight.popleft()
+                yield done_end, future.result()
+        while in_flight:
+            done_end, future = in_flight.popleft()
+            yield done_end, future.result()
+
+    def _apply(self, path: str, end: int, results: List, stats: Counter):
+        """Fold one batch into the aggregates and record progress in the same transaction"""
+        industries, skills = Counter(), Counter()
+        industry_rollups, skill_rollups = Counter(), Counter()
+        periods_by_day: Dict[str, List[Tuple[str, str]]] = {}
+        today = date.today().isoformat()
+        duplicates = 0
+        with self.conn:
+            for result in results:
+                if result is None:
+                    stats['skipped'] += 1
+                    continue
+                industry, posting_skills, fingerprint, posted_on = result
+                if fingerprint is not None and self._is_duplicate(fingerprint):
+                    duplicates += 1
+                    continue
+                industries[industry] += 1
+                for skill in posting_skills:
+                    skills[(industry, skill)] += 1
+
+                day = posted_on or today
+                periods = periods_by_day.get(day)
+                if periods is None:
+                    periods = periods_by_day[day] = [
+                        (granularity, period_start(date.fromisoformat(day), granularity).isoformat())
+                        for granularity in ROLLUP_GRANULARITIES
+                    ]
+                for granularity, period in periods:
+                    industry_rollups[(granularity, period, industry)] += 1
+                    for skill in posting_skills:
+                        skill_rollups[(granularity, period, skill)] += 1
+                stats['postings'] += 1
+            stats['duplicates'] += duplicates
+
+            self.conn.executemany(
+                'INSERT INTO industry_demand (industry, postings) VALUES (?, ?) '
+                'ON CONFLICT (industry) DO UPDATE SET postings = postings + excluded.postings',
+                industries.items()
+            )
+            self.conn.executemany(
+                'INSERT INTO skill_demand (industry, skill, postings) VALUES (?, ?, ?) '
+                'ON CONFLICT (industry, skill) DO UPDATE SET postings = postings + excluded.postings',
+                ((industry, skill, count) for (industry, skill), count in skills.items())
+            )
+            self.conn.executemany(
+                'INSERT INTO industry_rollups (granularity, period, industry, postings) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT (granularity, period, industry) DO UPDATE SET postings = postings + excluded.postings',
+                (key + (count,) for key, count in industry_rollups.items())
+            )
+            self.conn.executemany(
+                'INSERT INTO skill_rollups (granularity, period, skill, postings) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT (granularity, period, skill) DO UPDATE SET postings = postings + excluded.postings',
+                (key + (count,) for key, count in skill_rollups.items())
+            )
+            # size stays at its previous value until the whole file is done
+            self.conn.execute(
+                'INSERT INTO ingested_files (path, size, records_done, duplicates, updated_at) VALUES (?, -1, ?, ?, ?) '
+                'ON CONFLICT (path) DO UPDATE SET records_done = excluded.records_done, '
+                'duplicates = duplicates + excluded.duplicates, updated_at = excluded.updated_at',
+                (path, end, duplicates, time.time())
+            )
+
+    def _is_duplicate(self, fingerprint: int) -> bool:
+        """Check ``fingerprint`` against the stored ones; new fingerprints are stored"""
+        bands = fingerprint_bands(fingerprint)
+        for band, value in enumerate(bands):
+            for (stored,) in self.conn.execute(
+                'SELECT fingerprint FROM posting_fingerprints WHERE band = ? AND value = ?', (band, value)
+            ):
+                if bin((stored ^ fingerprint) & 0xFFFFFFFFFFFFFFFF).count('1') <= DUPLICATE_DISTANCE:
+                    return True
+        signed = _to_signed(fingerprint)
+        self.conn.executemany(
+            'INSERT OR IGNORE INTO posting_fingerprints (band, value, fingerprint) VALUES (?, ?, ?)',
+            ((band, value, signed) for band, value in enumerate(bands))
+        )
+        return False
+
+    def duplicate_count(self) -> int:
+        """Postings suppressed as duplicates over all runs"""
+        return self.conn.execute('SELECT COALESCE(SUM(duplicates), 0) FROM ingested_files').fetchone()[0]
+
+    def materialize_snapshot(self, keep: int = 5) -> int:
+        """Write the current aggregates as a new market snapshot and return its version"""
+        industries = {}
+        for industry, postings in self.conn.execute('SELECT industry, postings FROM industry_demand ORDER BY industry'):
+            skill_rows = self.conn.execute(
+                'SELECT skill, postings FROM skill_demand WHERE industry = ? ORDER BY postings DESC, skill LIMIT ?',
+                (industry, TOP_DEMAND_SKILLS)
+            ).fetchall()
+            industries[industry] = {
+                'job_openings': postings,
+                'demand_skills': [skill for skill, _ in skill_rows],
+                'skill_postings': {skill: count for skill, count in skill_rows}
+            }
+        created_at = time.time()
+        payload = {
+            'generated_at': created_at,
+            'industries': industries,
+            'skill_trends': rank_trends(demand_trends(self.conn, 'skill')),
+            'industry_trends': demand_trends(self.conn, 'industry', min_postings=1)
+        }
+        with self.conn:
+            cursor = self.conn.execute(
+                'INSERT INTO market_snapshots (created_at, payload) VALUES (?, ?)',
+                (created_at, json.dumps(payload, sort_keys=True))
+            )
+            version = cursor.lastrowid
+            self.conn.execute('DELETE FROM market_snapshots WHERE version <= ?', (version - keep,))
+        return version
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+        self.conn.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Ingest job-posting dumps into market demand aggregates')
+    parser.add_argument('directory', help='Directory containing .jsonl/.csv posting files')
+    parser.add_argument('--db', default='career_advisor.db', help='SQLite database path')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='Extraction processes (default: CPU count)')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Postings per extraction batch')
+    parser.add_argument('--watch', type=float, default=None, metavar='SECONDS',
+                        help='Keep scanning the directory at this interval')
+    args = parser.parse_args(argv)
+
+    ingestor = JobPostingIngestor(args.db, workers=args.workers, batch_size=args.batch_size)
+    try:
+        while True:
+            print(json.dumps(ingestor.ingest_directory(args.directory)), flush=True)
+            if args.watch is None:
+                break
+            time.sleep(args.watch)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        ingestor.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
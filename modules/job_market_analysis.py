@@ -1,21 +1,109 @@
 import sqlite3
 import json
 import requests
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Set, Tuple
 from datetime import datetime, timedelta
-import random
+import threading
+import numpy as np
+import scipy.sparse as sp
+from modules.market_factors import MarketFactorProvider, MARKET_DATA_VERSION
+from modules.job_ingestion import get_market_snapshot_version, load_market_snapshot
+from modules.json_fragments import JSONFragment, dumps
+from modules.salary_index import format_salary
+
+class MarketState:
+    """
+    One version of the market data: the curated trends with the ingested
+    snapshot overlaid, the industry x demand-skill matrix and the
+    pre-serialized static sections.
+
+    A state is built completely before it is published and is not modified
+    afterwards, so a request that reads one state never mixes data from two
+    market-data versions.
+    """
+    
+    def __init__(self, market_trends: Dict[str, Dict[str, Any]], market_indicators: Dict[str, Any],
+                 industry_average_salaries: Dict[str, int], snapshot_version: int):
+        self.market_trends = market_trends
+        self.market_indicators = market_indicators
+        self.industry_average_salaries = industry_average_salaries
+        self.snapshot_version = snapshot_version
+        self.market_factors = MarketFactorProvider(
+            f'{MARKET_DATA_VERSION}+postings.{snapshot_version}' if snapshot_version else MARKET_DATA_VERSION
+        )
+        self.static_sections: Dict[str, JSONFragment] = {}
+        self.market_snapshot: Optional[JSONFragment] = None
+        
+        # Industry x demand-skill incidence matrix and per-industry vectors
+        self.industry_names = list(market_trends.keys())
+        self.demand_skill_columns = {}
+        rows, cols = [], []
+        for row, data in enumerate(market_trends.values()):
+            for skill in dict.fromkeys(data['demand_skills']):
+                cols.append(self.demand_skill_columns.setdefault(skill, len(self.demand_skill_columns)))
+                rows.append(row)
+        self.industry_skill_matrix = sp.csr_matrix(
+            (np.ones(len(rows)), (rows, cols)),
+            shape=(len(self.industry_names), len(self.demand_skill_columns))
+        )
+        self.demand_skill_counts = np.array(
+            [len(data['demand_skills']) for data in market_trends.values()], dtype=np.float64
+        )
+        self.industry_growth_rates = np.array(
+            [data['growth_rate'] for data in market_trends.values()], dtype=np.float64
+        )
+        self.industry_remote_percentages = np.array(
+            [data.get('remote_work_percentage', 50) for data in market_trends.values()], dtype=np.float64
+        )
 
 class JobMarketAnalyzer:
     def __init__(self):
         self.db_path = 'career_advisor.db'
-        self.market_trends = {}
         self.industry_data = {}
-        self._load_market_data()
+        # Persistent connection used to poll for new ingested market snapshots
+        self._snapshot_conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._refresh_lock = threading.Lock()
+        # Current MarketState, replaced by a single assignment on refresh
+        self._state = self._load_market_data()
     
-    def _load_market_data(self):
+    @property
+    def market_trends(self) -> Dict[str, Dict[str, Any]]:
+        return self._state.market_trends
+    
+    @property
+    def market_indicators(self) -> Dict[str, Any]:
+        return self._state.market_indicators
+    
+    @property
+    def market_factors(self) -> MarketFactorProvider:
+        return self._state.market_factors
+    
+    @property
+    def snapshot_version(self) -> int:
+        return self._state.snapshot_version
+    
+    def refresh(self) -> bool:
+        """Reload market data if ingestion has published a newer snapshot"""
+        with self._refresh_lock:
+            if get_market_snapshot_version(self._snapshot_conn) == self._state.snapshot_version:
+                return False
+            self._state = self._load_market_data()
+            return True
+    
+    def market_data_version(self) -> str:
+        """Version of the market data in use, after picking up any newer snapshot"""
+        self.refresh()
+        return self._state.market_factors.version
+    
+    def get_market_snapshot(self) -> JSONFragment:
+        """Pre-serialized profile-independent market sections for the current market data"""
+        self.refresh()
+        return self._state.market_snapshot
+    
+    def _load_market_data(self) -> MarketState:
         """Load comprehensive market data and trends with real-time insights"""
         # Enhanced market data with more detailed insights
-        self.market_trends = {
+        market_trends = {
             'technology': {
                 'growth_rate': 12.5,
                 'demand_skills': ['Python Programming', 'Machine Learning', 'Data Analysis', 'Cloud Computing', 'DevOps', 'AI/ML'],
@@ -108,11 +196,24 @@ class JobMarketAnalyzer:
             }
         }
         
+        # Average salaries per industry, in Indian Rupees (formatted only when serialized)
+        industry_average_salaries = {
+            'technology': 950000,  # ₹9.5 LPA
+            'healthcare': 750000,  # ₹7.5 LPA
+            'finance': 850000,     # ₹8.5 LPA
+            'education': 650000    # ₹6.5 LPA
+        }
+        
         # Add real-time market indicators
-        self.market_indicators = {
+        market_indicators = {
             'overall_health': 78,
             'trending_skills': ['AI/ML', 'Cloud Computing', 'Cybersecurity', 'Data Science', 'DevOps'],
             'declining_skills': ['Legacy Systems', 'Traditional Marketing', 'Manual Testing'],
+            'trending_growth_rate': '+20%',
+            'declining_rate': '-10%',
+            'trend_window': None,
+            'industry_posting_trends': {},
+            'last_updated': None,
             'salary_trends': {
                 'technology': '+12%',
                 'healthcare': '+6%',
@@ -131,68 +232,120 @@ class JobMarketAnalyzer:
                 'long_term': 'AI and automation reshaping job landscape'
             }
         }
+        
+        # Overlay demand aggregates and trends from ingested job postings, if any
+        snapshot_version, snapshot = load_market_snapshot(self._snapshot_conn)
+        self._apply_market_snapshot(market_trends, snapshot.get('industries', {}))
+        self._apply_demand_trends(market_indicators, snapshot)
+        
+        state = MarketState(market_trends, market_indicators, industry_average_salaries, snapshot_version)
+        self._build_static_sections(state)
+        return state
     
-    def get_available_industries(self) -> List[str]:
-        """Get list of available industries"""
-        return list(self.market_trends.keys())
+    def _apply_market_snapshot(self, market_trends: Dict[str, Dict[str, Any]],
+                               ingested: Dict[str, Dict[str, Any]]):
+        """Replace openings and demand skills with counts from ingested postings"""
+        ingested = {industry: aggregate for industry, aggregate in ingested.items() if industry != 'other'}
+        scale = self._openings_scale(market_trends, ingested)
+        for industry, aggregate in ingested.items():
+            data = market_trends.get(industry)
+            if data is None:
+                # Industries only seen in postings get neutral defaults for the curated fields
+                data = market_trends[industry] = {
+                    'growth_rate': 0.0,
+                    'salary_trend': 'stable',
+                    'competition_level': 'medium',
+                    'remote_work_percentage': 50,
+                    'entry_level_salary': 'Competitive',
+                    'senior_level_salary': 'Competitive',
+                    'hot_skills': aggregate['demand_skills'][:4],
+                    'emerging_roles': [],
+                    'market_insights': []
+                }
+            # Posting counts are rescaled to the curated openings, so ingested and
+            # curated industries stay comparable
+            data['ingested_postings'] = aggregate['job_openings']
+            data['job_openings'] = int(round(aggregate['job_openings'] * scale))
+            if aggregate['demand_skills']:
+                data['demand_skills'] = aggregate['demand_skills']
+            data.setdefault('demand_skills', [])
     
-    def analyze_market(self, skill_analysis: Dict[str, Any]) -> Dict[str, Any]:
+    @staticmethod
+    def _openings_scale(market_trends: Dict[str, Dict[str, Any]], ingested: Dict[str, Dict[str, Any]]) -> float:
         """
-        Analyze current job market trends and opportunities
+        Factor converting posting counts to the scale of the curated openings.
+        The industries covered by both keep their curated total, shared out by
+        posting counts; with no overlap, the mean per industry is matched.
         """
-        matched_skills = skill_analysis.get('matched_skills', [])
-        skill_names = [skill['name'] for skill in matched_skills]
+        covered = [industry for industry in ingested if industry in market_trends]
+        curated = sum(market_trends[industry]['job_openings'] for industry in covered)
+        postings = sum(ingested[industry]['job_openings'] for industry in covered)
+        if curated and postings:
+            return curated / postings
         
-        # Analyze market opportunities for each industry
-        industry_opportunities = {}
-        for industry, data in self.market_trends.items():
-            opportunity_score = self._calculate_opportunity_score(skill_names, data)
-            industry_opportunities[industry] = {
-                'opportunity_score': opportunity_score,
-                'growth_rate': data['growth_rate'],
-                'demand_skills': data['demand_skills'],
-                'salary_trend': data['salary_trend'],
-                'job_openings': data['job_openings'],
-                'competition_level': data['competition_level'],
-                'skill_match_percentage': self._calculate_skill_match(skill_names, data['demand_skills'])
+        postings = sum(aggregate['job_openings'] for aggregate in ingested.values())
+        if not market_trends or not postings:
+            return 1.0
+        curated_mean = sum(data['job_openings'] for data in market_trends.values()) / len(market_trends)
+        return curated_mean / (postings / len(ingested))
+    
+    def _apply_demand_trends(self, market_indicators: Dict[str, Any], snapshot: Dict[str, Any]):
+        """Replace the curated trending/declining skills with growth measured over the posting rollups"""
+        skill_trends = snapshot.get('skill_trends')
+        if skill_trends and skill_trends.get('ranked'):
+            trending = skill_trends['trending'][:5]
+            declining = skill_trends['declining'][:5]
+            market_indicators['trending_skills'] = [mover['skill'] for mover in trending]
+            market_indicators['declining_skills'] = [mover['skill'] for mover in declining]
+            market_indicators['trending_growth_rate'] = self._format_growth(trending)
+            market_indicators['declining_rate'] = self._format_growth(declining)
+            market_indicators['trend_window'] = {
+                key: skill_trends[key] for key in ('granularity', 'periods', 'from', 'through')
             }
         
-        # Get top opportunities
-        top_opportunities = sorted(
-            industry_opportunities.items(), 
-            key=lambda x: x[1]['opportunity_score'], 
-            reverse=True
-        )[:3]
-        
-        # Analyze emerging trends
-        emerging_trends = self._identify_emerging_trends(skill_names)
-        
-        # Market insights
-        market_insights = self._generate_market_insights(skill_analysis, industry_opportunities)
-        
-        return {
-            'industry_opportunities': dict(top_opportunities),
-            'emerging_trends': emerging_trends,
-            'market_insights': market_insights,
-            'overall_market_health': self._assess_market_health(),
-            'skill_demand_analysis': self._analyze_skill_demand(skill_names),
-            'salary_insights': self._generate_salary_insights(industry_opportunities),
-            'real_time_indicators': self._get_real_time_indicators(),
-            'market_forecast': self._generate_market_forecast(),
-            'remote_work_analysis': self._analyze_remote_work_trends(),
-            'emerging_roles': self._identify_emerging_roles(skill_names),
-            'skill_trends': self._analyze_skill_trends(),
-            'geographic_insights': self._generate_geographic_insights()
-        }
+        industry_trends = snapshot.get('industry_trends')
+        if industry_trends:
+            market_indicators['industry_posting_trends'] = {
+                industry: f"{(stats['growth_ratio'] - 1) * 100:+.0f}%"
+                for industry, stats in industry_trends['growth'].items() if industry != 'other'
+            }
+        if 'generated_at' in snapshot:
+            market_indicators['last_updated'] = datetime.fromtimestamp(
+                snapshot['generated_at']).strftime('%Y-%m-%d %H:%M:%S')
+    
+    @staticmethod
+    def _format_growth(movers: List[Dict[str, Any]]) -> str:
+        """Mean growth of ``movers`` as a signed percentage"""
+        if not movers:
+            return '0%'
+        return f"{np.mean([mover['growth_ratio'] - 1 for mover in movers]) * 100:+.0f}%"
     
-    def _calculate_opportunity_score(self, skills: List[str], industry_data: Dict) -> float:
-        """Calculate opportunity score based on skill match and market factors"""
-        demand_skills = industry_data['demand_skills']
-        growth_rate = industry_data['growth_rate']
+    def score_industries(self, skill_lists: List[List[str]], market_factors: np.ndarray,
+                         state: Optional[MarketState] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Score every industry for a batch of profiles with one sparse product.
+        ``market_factors`` is profiles x industries; returns the demand-skill
+        match counts, skill match percentages and opportunity scores, each
+        profiles x industries.
+        """
+        state = state or self._state
+        rows, cols = [], []
+        for row, skills in enumerate(skill_lists):
+            for skill in skills:
+                col = state.demand_skill_columns.get(skill)
+                if col is not None:
+                    rows.append(row)
+                    cols.append(col)
+        profile_matrix = sp.csr_matrix(
+            (np.ones(len(rows)), (rows, cols)),
+            shape=(len(skill_lists), len(state.demand_skill_columns))
+        )
+        match_counts = (profile_matrix @ state.industry_skill_matrix.T).toarray()
         
         # Calculate skill match percentage
-        skill_matches = len([skill for skill in skills if skill in demand_skills])
-        skill_match_percentage = (skill_matches / len(demand_skills)) * 100 if demand_skills else 0
+        has_demand = state.demand_skill_counts > 0
+        skill_match_percentage = np.zeros_like(match_counts)
+        skill_match_percentage[:, has_demand] = (match_counts[:, has_demand] / state.demand_skill_counts[has_demand]) * 100
         
         # Weight factors
         skill_weight = 0.6
@@ -200,24 +353,108 @@ class JobMarketAnalyzer:
         market_weight = 0.1
         
         # Normalize growth rate (assuming max 20%)
-        normalized_growth = min(growth_rate / 20.0, 1.0)
+        normalized_growth = np.minimum(state.industry_growth_rates / 20.0, 1.0)
         
-        # Calculate opportunity score
-        opportunity_score = (
+        opportunity_scores = (
             skill_match_percentage * skill_weight +
             normalized_growth * 100 * growth_weight +
-            random.uniform(70, 90) * market_weight  # Simulated market factor
+            market_factors * market_weight  # Simulated market factor
         )
-        
-        return round(min(opportunity_score, 100), 2)
+        return match_counts, skill_match_percentage, np.round(np.minimum(opportunity_scores, 100), 2)
+    
+    def _build_static_sections(self, state: MarketState):
+        """Serialize the sections that do not depend on the profile, once per market-data version"""
+        builders = {
+            'real_time_indicators': lambda: self._get_real_time_indicators(state),
+            'market_forecast': lambda: self._generate_market_forecast(state),
+            'remote_work_analysis': lambda: self._analyze_remote_work_trends(state),
+            'skill_trends': lambda: self._analyze_skill_trends(state),
+            'geographic_insights': self._generate_geographic_insights
+        }
+        state.static_sections = {section: JSONFragment(build()) for section, build in builders.items()}
+        state.market_snapshot = JSONFragment(encoded=dumps(
+            dict(state.static_sections, market_data_version=state.market_factors.version),
+            sort_keys=True, separators=(',', ':')
+        ))
     
-    def _calculate_skill_match(self, user_skills: List[str], demand_skills: List[str]) -> float:
-        """Calculate percentage of demand skills that user has"""
-        if not demand_skills:
-            return 0.0
+    def get_available_industries(self) -> List[str]:
+        """Get list of available industries"""
+        return list(self._state.market_trends.keys())
+    
+    def analyze_market(self, skill_analysis: Dict[str, Any],
+                       include: Optional[Set[str]] = None) -> Dict[str, Any]:
+        """
+        Analyze current job market trends and opportunities.
+        ``include`` limits the optional sections that are built (None builds all).
+        """
+        self.refresh()
+        # Every read below goes through this one state, even if a refresh publishes a newer one meanwhile
+        state = self._state
+        static_sections = state.static_sections
+        matched_skills = skill_analysis.get('matched_skills', [])
+        skill_names = [skill['name'] for skill in matched_skills]
+        
+        # Simulated market factors, derived deterministically from the profile
+        market_factors = state.market_factors.uniform(
+            MarketFactorProvider.profile_key(skill_names), 'industry_opportunity',
+            70, 90, len(state.market_trends)
+        )
+        
+        # Score all industries at once
+        match_counts, skill_match, opportunity_scores = (
+            result[0] for result in self.score_industries([skill_names], market_factors[np.newaxis, :], state)
+        )
+        
+        def industry_opportunity(i: int) -> Dict[str, Any]:
+            data = state.market_trends[state.industry_names[i]]
+            return {
+                'opportunity_score': opportunity_scores[i],
+                'growth_rate': data['growth_rate'],
+                'demand_skills': data['demand_skills'],
+                'salary_trend': data['salary_trend'],
+                'job_openings': data['job_openings'],
+                'competition_level': data['competition_level'],
+                'skill_match_percentage': round(float(skill_match[i]), 2)
+            }
+        
+        # Get top opportunities (stable, so ties keep industry order)
+        top_opportunities = [
+            (state.industry_names[i], industry_opportunity(i))
+            for i in np.argsort(-opportunity_scores, kind='stable')[:3]
+        ]
+        
+        # Per-industry details for every industry are only built for the sections that use them
+        all_opportunities = None
+        def industry_opportunities() -> Dict[str, Dict[str, Any]]:
+            nonlocal all_opportunities
+            if all_opportunities is None:
+                all_opportunities = {
+                    industry: industry_opportunity(i) for i, industry in enumerate(state.industry_names)
+                }
+            return all_opportunities
+        
+        analysis = {'industry_opportunities': dict(top_opportunities)}
+        
+        # Optional sections are only built when requested; the profile-independent
+        # ones are pre-serialized fragments, shared by every response
+        optional_sections = {
+            'emerging_trends': lambda: self._identify_emerging_trends(skill_names),
+            'market_insights': lambda: self._generate_market_insights(skill_analysis, industry_opportunities()),
+            'overall_market_health': lambda: self._assess_market_health(),
+            'skill_demand_analysis': lambda: self._analyze_skill_demand(skill_names),
+            'salary_insights': lambda: self._generate_salary_insights(industry_opportunities(), state),
+            'real_time_indicators': lambda: static_sections['real_time_indicators'],
+            'market_forecast': lambda: static_sections['market_forecast'],
+            'remote_work_analysis': lambda: static_sections['remote_work_analysis'],
+            'emerging_roles': lambda: self._identify_emerging_roles(match_counts, state),
+            'skill_trends': lambda: static_sections['skill_trends'],
+            'geographic_insights': lambda: static_sections['geographic_insights']
+        }
+        for section, build in optional_sections.items():
+            if include is None or section in include:
+                analysis[section] = build()
         
-        matches = len([skill for skill in user_skills if skill in demand_skills])
-        return round((matches / len(demand_skills)) * 100, 2)
+        return analysis
     
     def _identify_emerging_trends(self, skills: List[str]) -> List[Dict[str, str]]:
         """Identify emerging trends relevant to user's skills"""
@@ -310,49 +547,48 @@ class JobMarketAnalyzer:
             'recommendation': 'Focus on high-demand skills for better opportunities'
         }
     
-    def _generate_salary_insights(self, industry_opportunities: Dict) -> Dict[str, Any]:
+    def _generate_salary_insights(self, industry_opportunities: Dict, state: MarketState) -> Dict[str, Any]:
         """Generate salary insights based on industry analysis"""
         avg_salaries = []
+        amounts = []
         for industry, data in industry_opportunities.items():
-            # Simulate salary data based on industry (in Indian Rupees)
-            base_salary = {
-                'technology': 950000,  # ₹9.5 LPA
-                'healthcare': 750000,  # ₹7.5 LPA
-                'finance': 850000,     # ₹8.5 LPA
-                'education': 650000    # ₹6.5 LPA
-            }.get(industry, 700000)    # ₹7 LPA default
-            
+            base_salary = state.industry_average_salaries.get(industry, 700000)  # ₹7 LPA default
+            amounts.append(base_salary)
             avg_salaries.append({
                 'industry': industry,
-                'average_salary': f"₹{base_salary:,}",
+                'average_salary': format_salary(base_salary),
                 'trend': data['salary_trend'],
                 'opportunity_score': data['opportunity_score']
             })
         
+        # Compare the numbers, not the formatted strings ("₹10,00,000" < "₹9,50,000" as text)
+        highest = max(range(len(amounts)), key=amounts.__getitem__)
         return {
             'industry_salaries': avg_salaries,
-            'highest_paying': max(avg_salaries, key=lambda x: x['average_salary']),
+            'highest_paying': avg_salaries[highest],
             'salary_trend': 'Overall positive growth across industries'
         }
     
-    def _get_real_time_indicators(self) -> Dict[str, Any]:
+    def _get_real_time_indicators(self, state: MarketState) -> Dict[str, Any]:
         """Get real-time market indicators"""
         return {
-            'market_health_score': self.market_indicators['overall_health'],
-            'trending_skills': self.market_indicators['trending_skills'],
-            'declining_skills': self.market_indicators['declining_skills'],
-            'salary_trends': self.market_indicators['salary_trends'],
-            'remote_work_distribution': self.market_indicators['remote_work_trends'],
-            'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'market_health_score': state.market_indicators['overall_health'],
+            'trending_skills': state.market_indicators['trending_skills'],
+            'declining_skills': state.market_indicators['declining_skills'],
+            'salary_trends': state.market_indicators['salary_trends'],
+            'remote_work_distribution': state.market_indicators['remote_work_trends'],
+            'industry_posting_trends': state.market_indicators['industry_posting_trends'],
+            'trend_window': state.market_indicators['trend_window'],
+            'last_updated': state.market_indicators['last_updated'] or datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             'data_source': 'AI Career Advisor Market Intelligence'
         }
     
-    def _generate_market_forecast(self) -> Dict[str, Any]:
+    def _generate_market_forecast(self, state: MarketState) -> Dict[str, Any]:
         """Generate market forecast and predictions"""
         return {
             'short_term_forecast': {
                 'timeline': 'Next 6 months',
-                'prediction': self.market_indicators['job_market_forecast']['next_6_months'],
+                'prediction': state.market_indicators['job_market_forecast']['next_6_months'],
                 'confidence': 'High',
                 'key_factors': [
                     'Tech sector continuing to lead growth',
@@ -362,7 +598,7 @@ class JobMarketAnalyzer:
             },
             'medium_term_forecast': {
                 'timeline': 'Next 12 months',
-                'prediction': self.market_indicators['job_market_forecast']['next_12_months'],
+                'prediction': state.market_indicators['job_market_forecast']['next_12_months'],
                 'confidence': 'Medium',
                 'key_factors': [
                     'Digital transformation accelerating',
@@ -372,7 +608,7 @@ class JobMarketAnalyzer:
             },
             'long_term_forecast': {
                 'timeline': '2-5 years',
-                'prediction': self.market_indicators['job_market_forecast']['long_term'],
+                'prediction': state.market_indicators['job_market_forecast']['long_term'],
                 'confidence': 'Medium',
                 'key_factors': [
                     'AI reshaping job landscape',
@@ -382,9 +618,9 @@ class JobMarketAnalyzer:
             }
         }
     
-    def _analyze_remote_work_trends(self) -> Dict[str, Any]:
+    def _analyze_remote_work_trends(self, state: MarketState) -> Dict[str, Any]:
         """Analyze remote work trends and opportunities"""
-        remote_trends = self.market_indicators['remote_work_trends']
+        remote_trends = state.market_indicators['remote_work_trends']
         
         return {
             'current_distribution': remote_trends,
@@ -395,7 +631,7 @@ class JobMarketAnalyzer:
             },
             'industry_remote_opportunities': {
                 industry: data['remote_work_percentage'] 
-                for industry, data in self.market_trends.items()
+                for industry, data in state.market_trends.items()
             },
             'remote_work_benefits': [
                 'Increased work-life balance',
@@ -411,42 +647,42 @@ class JobMarketAnalyzer:
             ]
         }
     
-    def _identify_emerging_roles(self, skills: List[str]) -> List[Dict[str, Any]]:
-        """Identify emerging roles based on current skills"""
+    def _identify_emerging_roles(self, match_counts: np.ndarray, state: MarketState) -> List[Dict[str, Any]]:
+        """Identify emerging roles in the industries where the user has relevant skills"""
         emerging_roles = []
         
-        for industry, data in self.market_trends.items():
+        # Only industries with at least one matching demand skill
+        for i in np.flatnonzero(match_counts):
+            industry = state.industry_names[i]
+            data = state.market_trends[industry]
             for role in data.get('emerging_roles', []):
-                # Check if user has relevant skills for this emerging role
-                relevant_skills = [skill for skill in skills if skill in data['demand_skills']]
-                if relevant_skills:
-                    emerging_roles.append({
-                        'role': role,
-                        'industry': industry,
-                        'growth_potential': 'High',
-                        'required_skills': data['demand_skills'],
-                        'user_skill_match': len(relevant_skills),
-                        'salary_range': data.get('entry_level_salary', 'Competitive'),
-                        'remote_opportunities': data.get('remote_work_percentage', 50),
-                        'description': f'Emerging role in {industry} with high growth potential'
-                    })
+                emerging_roles.append({
+                    'role': role,
+                    'industry': industry,
+                    'growth_potential': 'High',
+                    'required_skills': data['demand_skills'],
+                    'user_skill_match': int(match_counts[i]),
+                    'salary_range': data.get('entry_level_salary', 'Competitive'),
+                    'remote_opportunities': data.get('remote_work_percentage', 50),
+                    'description': f'Emerging role in {industry} with high growth potential'
+                })
         
         # Sort by skill match and growth potential
         emerging_roles.sort(key=lambda x: x['user_skill_match'], reverse=True)
         return emerging_roles[:10]  # Top 10 emerging roles
     
-    def _analyze_skill_trends(self) -> Dict[str, Any]:
+    def _analyze_skill_trends(self, state: MarketState) -> Dict[str, Any]:
         """Analyze skill trends and market demand"""
         return {
             'hot_skills': {
-                'skills': self.market_indicators['trending_skills'],
-                'growth_rate': '+20%',
+                'skills': state.market_indicators['trending_skills'],
+                'growth_rate': state.market_indicators['trending_growth_rate'],
                 'demand_level': 'Very High',
                 'salary_premium': '+15-25%'
             },
             'declining_skills': {
-                'skills': self.market_indicators['declining_skills'],
-                'decline_rate': '-10%',
+                'skills': state.market_indicators['declining_skills'],
+                'decline_rate': state.market_indicators['declining_rate'],
                 'recommendation': 'Consider upskilling or transitioning'
             },
             'stable_skills': {
@@ -0,0 +1,63 @@
+"""
+Pre-serialized JSON fragments.
+
+A ``JSONFragment`` holds a value that is serialized once (e.g. the static
+market sections, rebuilt only when the market data changes). ``dumps``
+splices the stored text into the surrounding document verbatim instead of
+re-encoding the value, and ``FragmentJSONProvider`` does the same for
+Flask's ``jsonify``.
+"""
+import hashlib
+import json
+import secrets
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider
+
+
+class JSONFragment:
+    """A JSON value serialized once and spliced into larger documents as-is"""
+
+    def __init__(self, value: Any = None, encoded: str = None):
+        # Keys are sorted like Flask's jsonify output
+        self.json = encoded if encoded is not None else json.dumps(value, sort_keys=True, separators=(',', ':'))
+        self.etag = hashlib.sha1(self.json.encode('utf-8')).hexdigest()
+
+    @property
+    def value(self) -> Any:
+        """The fragment as plain Python data, for callers that need to inspect it"""
+        return json.loads(self.json)
+
+    def __reduce__(self):
+        return JSONFragment, (None, self.json)
+
+
+def dumps(obj: Any, **kwargs) -> str:
+    """``json.dumps`` that writes ``JSONFragment`` values without re-encoding them"""
+    fragments = []
+    nonce = secrets.token_hex(8)
+    fallback = kwargs.pop('default', None)
+
+    def default(o):
+        if isinstance(o, JSONFragment):
+            fragments.append(o.json)
+            return f'{nonce}:{len(fragments) - 1}'
+        if fallback is not None:
+            return fallback(o)
+        raise TypeError(f'Object of type {type(o).__name__} is not JSON serializable')
+
+    text = json.dumps(obj, default=default, **kwargs)
+    # Each fragment was encoded as a placeholder string that user data cannot forge
+    for i, fragment in enumerate(fragments):
+        text = text.replace(f'"{nonce}:{i}"', fragment, 1)
+    return text
+
+
+class FragmentJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that splices ``JSONFragment`` values into responses"""
+
+    def dumps(self, obj: Any, **kwargs) -> str:
+        kwargs.setdefault('default', self.default)
+        kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+        kwargs.setdefault('sort_keys', self.sort_keys)
+        return dumps(obj, **kwargs)
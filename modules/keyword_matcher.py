@@ -0,0 +1,63 @@
+"""
+Multi-keyword substring matching.
+
+``KeywordMatcher`` compiles groups of keywords (e.g. the keywords of each
+industry) into one Aho-Corasick automaton, so a text is scanned once to find
+every group with a keyword occurring in it, however many groups and
+keywords there are. Matching is case-insensitive substring matching, the
+same as ``keyword.lower() in text.lower()``.
+"""
+from collections import deque
+from typing import Dict, List, Iterable, FrozenSet, Set
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over keyword groups"""
+
+    def __init__(self, groups: Dict[str, Iterable[str]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        outputs: List[Set[str]] = [set()]
+        for group, keywords in groups.items():
+            for keyword in keywords:
+                state = 0
+                for char in keyword.lower():
+                    next_state = self._goto[state].get(char)
+                    if next_state is None:
+                        next_state = len(self._goto)
+                        self._goto[state][char] = next_state
+                        self._goto.append({})
+                        self._fail.append(0)
+                        outputs.append(set())
+                    state = next_state
+                outputs[state].add(group)
+
+        # Failure links in breadth-first order, so shallower states are final first
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                # A state also matches every keyword that is a suffix of its path
+                outputs[next_state] |= outputs[self._fail[next_state]]
+
+        self._outputs: List[FrozenSet[str]] = [frozenset(groups_found) for groups_found in outputs]
+        self._group_count = len({group for groups_found in outputs for group in groups_found})
+
+    def groups_in(self, text: str) -> FrozenSet[str]:
+        """Groups with at least one keyword occurring in ``text``"""
+        found = set(self._outputs[0])
+        state = 0
+        for char in text.lower():
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            if self._outputs[state]:
+                found |= self._outputs[state]
+                if len(found) == self._group_count:
+                    break
+        return frozenset(found)
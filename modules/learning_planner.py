@@ -1,5 +1,5 @@
 import json
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Set
 from datetime import datetime, timedelta
 import random
 
@@ -293,9 +293,10 @@ class LearningPlanGenerator:
         }
     
     def generate_plan(self, skill_analysis: Dict, career_recommendations: Dict, 
-                     student_data: Dict) -> Dict[str, Any]:
+                     student_data: Dict, include: Optional[Set[str]] = None) -> Dict[str, Any]:
         """
-        Generate personalized learning plan based on skill gaps and career goals
+        Generate personalized learning plan based on skill gaps and career goals.
+        ``include`` limits the optional sections that are built (None builds all).
         """
         matched_skills = skill_analysis.get('matched_skills', [])
         skill_names = [skill['name'] for skill in matched_skills]
@@ -308,35 +309,39 @@ class LearningPlanGenerator:
         # Identify skill gaps from top careers
         skill_gaps = self._identify_skill_gaps(top_careers, skill_names)
         
-        # Generate learning recommendations
-        course_recommendations = self._recommend_courses(skill_gaps)
-        certification_recommendations = self._recommend_certifications(skill_gaps)
-        project_recommendations = self._recommend_projects(skill_gaps)
+        # Recommendations feed several sections, so build each one at most once
+        built = {}
+        def recommendations(kind: str) -> List[Dict[str, Any]]:
+            if kind not in built:
+                built[kind] = {
+                    'courses': self._recommend_courses,
+                    'certifications': self._recommend_certifications,
+                    'projects': self._recommend_projects
+                }[kind](skill_gaps)
+            return built[kind]
         
-        # Create learning timeline
-        learning_timeline = self._create_learning_timeline(
-            course_recommendations, certification_recommendations, project_recommendations
-        )
+        plan = {'skill_gaps': skill_gaps}
         
-        # Generate study schedule
-        study_schedule = self._generate_study_schedule(student_data)
-        
-        # Calculate learning metrics
-        learning_metrics = self._calculate_learning_metrics(
-            skill_gaps, course_recommendations, certification_recommendations
-        )
-        
-        return {
-            'skill_gaps': skill_gaps,
-            'course_recommendations': course_recommendations,
-            'certification_recommendations': certification_recommendations,
-            'project_recommendations': project_recommendations,
-            'learning_timeline': learning_timeline,
-            'study_schedule': study_schedule,
-            'learning_metrics': learning_metrics,
-            'learning_goals': self._generate_learning_goals(skill_gaps, top_careers),
-            'progress_tracking': self._setup_progress_tracking()
+        # Optional sections are only built when requested
+        optional_sections = {
+            'course_recommendations': lambda: recommendations('courses'),
+            'certification_recommendations': lambda: recommendations('certifications'),
+            'project_recommendations': lambda: recommendations('projects'),
+            'learning_timeline': lambda: self._create_learning_timeline(
+                recommendations('courses'), recommendations('certifications'), recommendations('projects')
+            ),
+            'study_schedule': lambda: self._generate_study_schedule(student_data),
+            'learning_metrics': lambda: self._calculate_learning_metrics(
+                skill_gaps, recommendations('courses'), recommendations('certifications')
+            ),
+            'learning_goals': lambda: self._generate_learning_goals(skill_gaps, top_careers),
+            'progress_tracking': lambda: self._setup_progress_tracking()
         }
+        for section, build in optional_sections.items():
+            if include is None or section in include:
+                plan[section] = build()
+        
+        return plan
     
     def _identify_skill_gaps(self, top_careers: List[Dict], current_skills: List[str]) -> List[Dict[str, Any]]:
         """Identify skill gaps from top career recommendations"""
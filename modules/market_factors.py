@@ -0,0 +1,32 @@
+import hashlib
+from typing import Iterable
+
+import numpy as np
+
+# Bump whenever the hardcoded market data changes so derived factors change with it
+MARKET_DATA_VERSION = '2024.1'
+
+
+class MarketFactorProvider:
+    """
+    Deterministic replacement for the simulated ``random.uniform`` market factors.
+
+    Factors are drawn from a generator seeded with the market-data version, a
+    named stream and a hash of the profile, so the same profile always gets
+    the same factors for a given market-data version.
+    """
+
+    def __init__(self, version: str = MARKET_DATA_VERSION):
+        self.version = version
+
+    @staticmethod
+    def profile_key(*parts: Iterable[str]) -> str:
+        """Stable hash of one or more string collections, independent of their order"""
+        canonical = '|'.join(','.join(sorted({str(item).strip() for item in part})) for part in parts)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def uniform(self, profile_key: str, stream: str, low: float, high: float, size: int) -> np.ndarray:
+        """Draw ``size`` factors in ``[low, high)`` for ``profile_key`` from the named stream"""
+        digest = hashlib.sha256(f'{self.version}|{stream}|{profile_key}'.encode('utf-8')).digest()
+        rng = np.random.default_rng(int.from_bytes(digest[:8], 'big'))
+        return rng.uniform(low, high, size)
@@ -0,0 +1,147 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Optional, Union
+
+from modules.catalog_version import ensure_catalog_version_tracking, get_catalog_version
+from modules.json_fragments import dumps
+
+
+class AnalysisCache:
+    """
+    Two-tier cache for analysis results.
+
+    Tier one is an in-process LRU; tier two is a SQLite table that every
+    worker process can read. Keys are a canonical hash of the normalized
+    student profile, the requested fields and the data version (market-data
+    version plus the catalog version maintained by triggers on the
+    ``skills`` and ``careers`` tables), so catalog edits invalidate old
+    entries automatically. ``market_data_version`` may be a callable so that
+    newly ingested market snapshots are picked up as well.
+    """
+
+    def __init__(self, catalog_db_path: str = 'career_advisor.db',
+                 cache_db_path: str = 'analysis_cache.db',
+                 market_data_version: Union[str, Callable[[], str]] = '',
+                 max_entries: int = 1024,
+                 max_disk_entries: int = 50000,
+                 ttl_seconds: float = 3600):
+        self.market_data_version = market_data_version
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl_seconds = ttl_seconds
+        self._memory = OrderedDict()  # key -> (created_at, value)
+        self._lock = threading.Lock()
+        self._writes_since_eviction = 0
+        self._data_version = None
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0,
+                      'writes': 0, 'evictions': 0, 'invalidations': 0}
+
+        self._catalog_conn = sqlite3.connect(catalog_db_path, check_same_thread=False)
+        ensure_catalog_version_tracking(self._catalog_conn)
+
+        self._conn = sqlite3.connect(cache_db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS analysis_cache (
+                key TEXT PRIMARY KEY,
+                data_version TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_analysis_cache_created ON analysis_cache (created_at)')
+        self._conn.commit()
+
+    def data_version(self) -> str:
+        """Current data version; drops stale entries when the catalog has changed"""
+        with self._lock:
+            market_version = self.market_data_version() if callable(self.market_data_version) else self.market_data_version
+            version = f'{market_version}:{get_catalog_version(self._catalog_conn)}'
+            if version != self._data_version:
+                if self._data_version is not None:
+                    self.stats['invalidations'] += 1
+                self._memory.clear()
+                self._conn.execute('DELETE FROM analysis_cache WHERE data_version != ?', (version,))
+                self._conn.commit()
+                self._data_version = version
+            return version
+
+    def make_key(self, student_data: Dict[str, Any], fields_key: str = '') -> str:
+        """Canonical hash of a normalized profile, field selection and data version"""
+        canonical = json.dumps({
+            'profile': student_data,
+            'fields': fields_key,
+            'version': self.data_version()
+        }, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if now - entry[0] <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self.stats['memory_hits'] += 1
+                    return entry[1]
+                del self._memory[key]
+
+            row = self._conn.execute(
+                'SELECT payload, created_at FROM analysis_cache WHERE key = ? AND created_at >= ?',
+                (key, now - self.ttl_seconds)
+            ).fetchone()
+            if row is None:
+                self.stats['misses'] += 1
+                return None
+
+            value = json.loads(row[0])
+            self._remember(key, row[1], value)
+            self.stats['disk_hits'] += 1
+            return value
+
+    def set(self, key: str, value: Dict[str, Any]):
+        payload = dumps(value)
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, value)
+            self._conn.execute(
+                'INSERT OR REPLACE INTO analysis_cache (key, data_version, payload, created_at) VALUES (?, ?, ?, ?)',
+                (key, self._data_version or '', payload, now)
+            )
+            self.stats['writes'] += 1
+            self._writes_since_eviction += 1
+            # Trim the shared tier every so often rather than on every write
+            if self._writes_since_eviction >= max(1, self.max_disk_entries // 10):
+                self._evict_disk(now)
+            self._conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.stats['memory_hits'] + self.stats['disk_hits'] + self.stats['misses']
+            hits = self.stats['memory_hits'] + self.stats['disk_hits']
+            return dict(self.stats,
+                        memory_entries=len(self._memory),
+                        hit_rate=round(hits / lookups, 4) if lookups else 0.0,
+                        data_version=self._data_version)
+
+    def _remember(self, key: str, created_at: float, value: Dict[str, Any]):
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def _evict_disk(self, now: float):
+        self._writes_since_eviction = 0
+        self._conn.execute('DELETE FROM analysis_cache WHERE created_at < ?', (now - self.ttl_seconds,))
+        cursor = self._conn.execute('''
+            DELETE FROM analysis_cache WHERE key IN (
+                SELECT key FROM analysis_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?
+            )
+        ''', (self.max_disk_entries,))
+        self.stats['evictions'] += max(cursor.rowcount, 0)
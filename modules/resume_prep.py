@@ -1,5 +1,5 @@
 import json
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Set
 from datetime import datetime
 import random
 import os
@@ -262,9 +262,10 @@ Real-time Chat Application | GitHub: github.com/username/chat-app
         }
     
     def prepare_guidance(self, student_data: Dict, career_recommendations: Dict, 
-                        skill_analysis: Dict) -> Dict[str, Any]:
+                        skill_analysis: Dict, include: Optional[Set[str]] = None) -> Dict[str, Any]:
         """
-        Generate comprehensive resume and interview preparation guidance
+        Generate comprehensive resume and interview preparation guidance.
+        ``include`` limits the sections that are built (None builds all).
         """
         top_careers = career_recommendations.get('top_careers', [])
         if not top_careers:
@@ -274,39 +275,24 @@ Real-time Chat Application | GitHub: github.com/username/chat-app
         best_career = top_careers[0]
         career_title = best_career['title']
         
-        # Generate resume guidance
-        resume_guidance = self._generate_resume_guidance(student_data, best_career, skill_analysis)
-        
-        # Generate interview preparation
-        interview_prep = self._generate_interview_preparation(career_title, skill_analysis)
-        
-        # Generate portfolio recommendations
-        portfolio_recommendations = self._generate_portfolio_recommendations(
-            student_data, best_career, skill_analysis
-        )
-        
-        # Generate networking guidance
-        networking_guidance = self._generate_networking_guidance(career_title, best_career)
-        
-        # Generate interactive resume builder
-        resume_builder = self._generate_resume_builder(student_data, best_career, skill_analysis)
-        
-        # Generate downloadable templates
-        downloadable_templates = self._generate_downloadable_templates(career_title)
-        
-        # Generate ATS optimization tools
-        ats_optimization = self._generate_ats_optimization_tools(career_title, skill_analysis)
+        sections = {
+            'resume_guidance': lambda: self._generate_resume_guidance(student_data, best_career, skill_analysis),
+            'interview_preparation': lambda: self._generate_interview_preparation(career_title, skill_analysis),
+            'portfolio_recommendations': lambda: self._generate_portfolio_recommendations(
+                student_data, best_career, skill_analysis
+            ),
+            'networking_guidance': lambda: self._generate_networking_guidance(career_title, best_career),
+            'application_strategy': lambda: self._generate_application_strategy(best_career),
+            'skill_optimization': lambda: self._optimize_skills_for_ats(skill_analysis, career_title),
+            # Interactive resume builder, downloadable templates and ATS tools
+            'resume_builder': lambda: self._generate_resume_builder(student_data, best_career, skill_analysis),
+            'downloadable_templates': lambda: self._generate_downloadable_templates(career_title),
+            'ats_optimization': lambda: self._generate_ats_optimization_tools(career_title, skill_analysis)
+        }
         
         return {
-            'resume_guidance': resume_guidance,
-            'interview_preparation': interview_prep,
-            'portfolio_recommendations': portfolio_recommendations,
-            'networking_guidance': networking_guidance,
-            'application_strategy': self._generate_application_strategy(best_career),
-            'skill_optimization': self._optimize_skills_for_ats(skill_analysis, career_title),
-            'resume_builder': resume_builder,
-            'downloadable_templates': downloadable_templates,
-            'ats_optimization': ats_optimization
+            section: build() for section, build in sections.items()
+            if include is None or section in include
         }
     
     def _generate_resume_guidance(self, student_data: Dict, career: Dict, 
@@ -0,0 +1,143 @@
+"""
+Numeric salary bands.
+
+Salary ranges are stored as display strings ("₹8,00,000 - ₹20,00,000",
+"$75,000 - $125,000", "₹9.5 LPA"). They are parsed once into numeric
+bands and kept in sorted arrays per currency and industry, so percentile
+and range queries are bisections; amounts are formatted only when a
+response is serialized.
+"""
+import re
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Any, NamedTuple, Optional, Tuple
+
+DEFAULT_CURRENCY = 'INR'
+
+_SYMBOLS = {'₹': 'INR', 'rs': 'INR', 'inr': 'INR', '$': 'USD', 'usd': 'USD', '€': 'EUR', '£': 'GBP'}
+_CURRENCY_SYMBOLS = {'INR': '₹', 'USD': '$', 'EUR': '€', 'GBP': '£'}
+_UNITS = {'k': 1_000, 'l': 100_000, 'lpa': 100_000, 'lakh': 100_000, 'lakhs': 100_000,
+          'cr': 10_000_000, 'crore': 10_000_000, 'crores': 10_000_000}
+
+_AMOUNT = re.compile(r'(\d[\d,]*(?:\.\d+)?)\s*(lpa|lakhs?|crores?|cr|l|k)?\b', re.IGNORECASE)
+_CURRENCY = re.compile(r'₹|\$|€|£|\brs\b\.?|\binr\b|\busd\b', re.IGNORECASE)
+
+
+class SalaryBand(NamedTuple):
+    minimum: int
+    maximum: int
+    median: int
+    currency: str
+
+
+def parse_salary_range(text: Any) -> Optional[SalaryBand]:
+    """Parse a salary display string; None if it carries no amount (e.g. "Competitive")"""
+    if not isinstance(text, str):
+        return None
+    matches = _AMOUNT.findall(text)[:2]
+    if not matches:
+        return None
+    # "8 - 20 LPA": a unit written once applies to both ends
+    shared_unit = matches[-1][1]
+    amounts = [int(round(float(number.replace(',', '')) * _UNITS.get((unit or shared_unit).lower(), 1)))
+               for number, unit in matches]
+    currency = _CURRENCY.search(text)
+    minimum, maximum = min(amounts), max(amounts)
+    return SalaryBand(minimum, maximum, (minimum + maximum) // 2,
+                      _SYMBOLS[currency.group(0).lower().rstrip('.')] if currency else DEFAULT_CURRENCY)
+
+
+def format_salary(amount: int, currency: str = DEFAULT_CURRENCY) -> str:
+    return f'{_CURRENCY_SYMBOLS.get(currency, currency + " ")}{int(amount):,}'
+
+
+def format_salary_band(band: SalaryBand) -> str:
+    return f'{format_salary(band.minimum, band.currency)} - {format_salary(band.maximum, band.currency)}'
+
+
+class _SortedBands:
+    """Careers of one (currency, industry) group ordered by median, minimum and maximum"""
+
+    def __init__(self, entries: List[Tuple[str, SalaryBand]]):
+        by_median = sorted(entries, key=lambda entry: (entry[1].median, entry[0]))
+        self.medians = [band.median for _, band in by_median]
+        self.titles = [title for title, _ in by_median]
+        self.minimums = sorted(band.minimum for _, band in entries)
+        self.maximums = sorted(band.maximum for _, band in entries)
+
+
+class SalaryIndex:
+    """
+    Salary bands of every career, grouped by currency and industry.
+
+    ``percentile_of`` and ``salary_at`` rank by band median; ``careers_in_range``
+    returns the careers whose median falls in ``[low, high]`` and
+    ``overlap_count`` counts bands intersecting it. All are O(log n) bisections
+    (plus the size of the result).
+    """
+
+    def __init__(self, careers: Dict[str, Dict[str, Any]]):
+        self.bands: Dict[str, SalaryBand] = {}
+        groups: Dict[Tuple[str, Optional[str]], List[Tuple[str, SalaryBand]]] = {}
+        for title, data in careers.items():
+            band = parse_salary_range(data.get('salary_range'))
+            if band is None:
+                continue
+            self.bands[title] = band
+            industry = (data.get('industry') or '').casefold() or None
+            groups.setdefault((band.currency, None), []).append((title, band))
+            if industry:
+                groups.setdefault((band.currency, industry), []).append((title, band))
+        self._groups = {key: _SortedBands(entries) for key, entries in groups.items()}
+
+    def band(self, title: str) -> Optional[SalaryBand]:
+        return self.bands.get(title)
+
+    def _group(self, industry: Optional[str], currency: str) -> Optional[_SortedBands]:
+        return self._groups.get((currency, industry.casefold() if industry else None))
+
+    def percentile_of(self, salary: float, industry: Optional[str] = None,
+                      currency: str = DEFAULT_CURRENCY) -> Optional[float]:
+        """Share of careers (in %) whose median salary is at or below ``salary``"""
+        group = self._group(industry, currency)
+        if group is None:
+            return None
+        return round(bisect_right(group.medians, salary) / len(group.medians) * 100, 2)
+
+    def salary_at(self, percentile: float, industry: Optional[str] = None,
+                  currency: str = DEFAULT_CURRENCY) -> Optional[int]:
+        """Median salary at ``percentile`` (nearest rank)"""
+        group = self._group(industry, currency)
+        if group is None:
+            return None
+        rank = min(max(int(-(-percentile * len(group.medians) // 100)), 1), len(group.medians))
+        return group.medians[rank - 1]
+
+    def careers_in_range(self, low: float, high: float, industry: Optional[str] = None,
+                         currency: str = DEFAULT_CURRENCY) -> List[str]:
+        """Careers whose median salary lies in ``[low, high]``, lowest first"""
+        group = self._group(industry, currency)
+        if group is None:
+            return []
+        return group.titles[bisect_left(group.medians, low):bisect_right(group.medians, high)]
+
+    def overlap_count(self, low: float, high: float, industry: Optional[str] = None,
+                      currency: str = DEFAULT_CURRENCY) -> int:
+        """Number of salary bands that intersect ``[low, high]``"""
+        group = self._group(industry, currency)
+        if group is None:
+            return 0
+        # Everything except bands ending below ``low`` or starting above ``high``
+        below = bisect_left(group.maximums, low)
+        above = len(group.minimums) - bisect_right(group.minimums, high)
+        return len(group.minimums) - below - above
+
+    def summary(self, industry: Optional[str] = None, currency: str = DEFAULT_CURRENCY) -> Dict[str, Any]:
+        """Quartiles of the median salaries, formatted for display"""
+        group = self._group(industry, currency)
+        if group is None:
+            return {}
+        return {
+            'careers': len(group.medians),
+            'currency': currency,
+            **{f'p{p}': format_salary(self.salary_at(p, industry, currency), currency) for p in (25, 50, 75)}
+        }
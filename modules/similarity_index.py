@@ -0,0 +1,70 @@
+from typing import List, Tuple
+
+import numpy as np
+from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
+
+
+class BruteForceSimilarityIndex:
+    """
+    Reference index: dense cosine similarity against every skill followed by
+    a full sort. Kept for comparison and for very small catalogs.
+    """
+
+    def __init__(self, skill_vectors, postings=None):
+        self.skill_vectors = skill_vectors
+
+    def top_k(self, query_vector, k: int, threshold: float,
+              exclude_mask: np.ndarray) -> List[Tuple[int, float]]:
+        """Return up to ``k`` ``(skill_index, score)`` pairs scoring above ``threshold``"""
+        similarities = cosine_similarity(query_vector, self.skill_vectors)[0]
+        results = []
+        for idx in np.argsort(similarities, kind='stable')[::-1]:
+            if similarities[idx] <= threshold:
+                break
+            if not exclude_mask[idx]:
+                results.append((int(idx), similarities[idx]))
+                if len(results) >= k:
+                    break
+        return results
+
+
+class InvertedSimilarityIndex:
+    """
+    Inverted index over TF-IDF terms.
+
+    The L2-normalized skill matrix is stored transposed (term -> skills), so a
+    query only touches the posting lists of its own terms. Candidates are
+    pruned by the threshold and the exclusion mask, and the best ``k`` are
+    picked with ``argpartition``; cost grows with posting-list length rather
+    than catalog size. Scores match ``cosine_similarity`` exactly, and ties
+    are ordered by descending skill index like the reference path.
+    """
+
+    def __init__(self, skill_vectors=None, postings=None):
+        # Prebuilt (e.g. memory-mapped) postings skip the normalize/transpose step
+        self.postings = postings if postings is not None else self.build_postings(skill_vectors)
+
+    @staticmethod
+    def build_postings(skill_vectors):
+        """Term -> skills matrix of L2-normalized skill vectors"""
+        return normalize(skill_vectors).T.tocsr()
+
+    def top_k(self, query_vector, k: int, threshold: float,
+              exclude_mask: np.ndarray) -> List[Tuple[int, float]]:
+        """Return up to ``k`` ``(skill_index, score)`` pairs scoring above ``threshold``"""
+        scores = (normalize(query_vector) @ self.postings).tocsr()
+        indices, values = scores.indices, scores.data
+
+        keep = (values > threshold) & ~exclude_mask[indices]
+        indices, values = indices[keep], values[keep]
+
+        if len(values) > k:
+            # Keep everything tied with the k-th best so tie-breaking stays exact
+            kth_best = np.partition(values, len(values) - k)[len(values) - k]
+            best = values >= kth_best
+            indices, values = indices[best], values[best]
+
+        # Highest score first, ties broken by descending index
+        order = np.lexsort((-indices, -values))[:k]
+        return [(int(indices[i]), values[i]) for i in order]
@@ -0,0 +1,160 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple, Iterable
+
+import numpy as np
+
+from modules.catalog_version import ensure_catalog_version_tracking, get_catalog_version
+
+
+def ensure_alias_table(conn: sqlite3.Connection):
+    """Create the ``skill_aliases`` table mapping alternative spellings to skill names"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS skill_aliases (
+            alias TEXT PRIMARY KEY,
+            skill_name TEXT NOT NULL
+        )
+    ''')
+    conn.commit()
+
+
+class CatalogSnapshot:
+    """
+    Immutable view of the skills table, ordered by category and name.
+
+    The skill dicts are shared by every request that reads this snapshot and
+    must be treated as read-only.
+    """
+
+    def __init__(self, rows: List[Tuple[int, str, str, str]], version: int,
+                 aliases: Iterable[Tuple[str, str]] = ()):
+        self.version = version
+        # (alias, skill name) pairs from the skill_aliases table
+        self.aliases: Tuple[Tuple[str, str], ...] = tuple(aliases)
+        self.skills: Tuple[Dict[str, str], ...] = tuple(
+            {'name': name, 'category': category, 'description': description}
+            for _, name, category, description in rows
+        )
+        self.ids: Tuple[int, ...] = tuple(row[0] for row in rows)
+        self.names: Tuple[str, ...] = tuple(skill['name'] for skill in self.skills)
+        self.index_by_name: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+
+        category_indices: Dict[str, List[int]] = {}
+        for i, skill in enumerate(self.skills):
+            category_indices.setdefault(skill['category'], []).append(i)
+        self.category_indices: Dict[str, Tuple[int, ...]] = {
+            category: tuple(indices) for category, indices in category_indices.items()
+        }
+        self.by_category: Dict[str, Tuple[Dict[str, str], ...]] = {
+            category: tuple(self.skills[i] for i in indices)
+            for category, indices in self.category_indices.items()
+        }
+        # Boolean membership vectors over catalog indices, one per category
+        self.category_masks: Dict[str, np.ndarray] = {}
+        for category, indices in self.category_indices.items():
+            mask = np.zeros(len(self.skills), dtype=bool)
+            mask[list(indices)] = True
+            mask.setflags(write=False)
+            self.category_masks[category] = mask
+        self._empty_mask = np.zeros(len(self.skills), dtype=bool)
+        self._empty_mask.setflags(write=False)
+
+    def profile_mask(self, names: Iterable[str]) -> np.ndarray:
+        """Boolean vector marking the catalog skills present in ``names``"""
+        mask = np.zeros(len(self.skills), dtype=bool)
+        indices = [self.index_by_name[name] for name in names if name in self.index_by_name]
+        mask[indices] = True
+        return mask
+
+    def category_mask(self, category: str) -> np.ndarray:
+        """Read-only membership vector for ``category`` (all False if unknown)"""
+        return self.category_masks.get(category, self._empty_mask)
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+
+class SkillCatalog:
+    """
+    In-memory skill catalog that re-reads SQLite only when it has changed.
+
+    ``current()`` checks ``PRAGMA data_version`` (which moves whenever another
+    connection commits to the database) and only then consults the
+    ``catalog_version`` row, so the common path costs no disk reads and no
+    allocations.
+    """
+
+    def __init__(self, db_path: str = 'career_advisor.db'):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        try:
+            ensure_alias_table(self._conn)
+            ensure_catalog_version_tracking(self._conn)
+        except sqlite3.OperationalError:
+            # Read-only deployments fall back to reloading on any database change
+            pass
+        self._data_version = self._pragma_data_version()
+        self._snapshot = self._load(get_catalog_version(self._conn))
+
+    def current(self) -> CatalogSnapshot:
+        """Return the latest snapshot, reloading it only if the catalog changed"""
+        with self._lock:
+            data_version = self._pragma_data_version()
+            if data_version != self._data_version:
+                self._data_version = data_version
+                catalog_version = get_catalog_version(self._conn)
+                if catalog_version != self._snapshot.version or catalog_version == 0:
+                    self._snapshot = self._load(catalog_version)
+            return self._snapshot
+
+    def add_skill(self, name: str, category: str, description: str) -> bool:
+        """Insert a skill; returns False if a skill with that name already exists"""
+        with self._writer() as conn:
+            cursor = conn.execute(
+                'INSERT OR IGNORE INTO skills (name, category, description) VALUES (?, ?, ?)',
+                (name, category, description)
+            )
+            return cursor.rowcount > 0
+
+    def update_skill(self, name: str, category: Optional[str] = None,
+                     description: Optional[str] = None) -> bool:
+        """Update a skill's category and/or description; returns False if it does not exist"""
+        with self._writer() as conn:
+            cursor = conn.execute(
+                'UPDATE skills SET category = COALESCE(?, category), '
+                'description = COALESCE(?, description) WHERE name = ?',
+                (category, description, name)
+            )
+            return cursor.rowcount > 0
+
+    def delete_skill(self, name: str) -> bool:
+        """Delete a skill; returns False if it does not exist"""
+        with self._writer() as conn:
+            return conn.execute('DELETE FROM skills WHERE name = ?', (name,)).rowcount > 0
+
+    @contextmanager
+    def _writer(self):
+        # Writes go through their own connection so that PRAGMA data_version
+        # on the reader connection notices them like any other writer's commit
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _pragma_data_version(self) -> int:
+        return self._conn.execute('PRAGMA data_version').fetchone()[0]
+
+    def _load(self, catalog_version: int) -> CatalogSnapshot:
+        rows = self._conn.execute(
+            'SELECT id, name, category, description FROM skills ORDER BY category, name'
+        ).fetchall()
+        try:
+            aliases = self._conn.execute('SELECT alias, skill_name FROM skill_aliases ORDER BY alias').fetchall()
+        except sqlite3.OperationalError:
+            aliases = []
+        return CatalogSnapshot(rows, catalog_version, aliases)
+
@@ -1,151 +1,172 @@
-import sqlite3
-import json
-from typing import Dict, List, Any
+import threading
+import os
+from typing import Dict, List, Any, Optional, Set
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from modules.skill_catalog import SkillCatalog, CatalogSnapshot
+from modules.similarity_index import InvertedSimilarityIndex
+from modules.skill_model_store import SkillModelStore
+from modules.incremental_vectorizer import IncrementalSkillVectorizer
+from modules.skill_normalizer import SkillNormalizer
 
 class SkillMappingEngine:
-    def __init__(self):
-        self.db_path = 'career_advisor.db'
+    def __init__(self, similarity_index_cls=InvertedSimilarityIndex,
+                 vectorizer_mode: Optional[str] = None, db_path: str = 'career_advisor.db'):
+        self.db_path = db_path
+        self.catalog = SkillCatalog(self.db_path)
+        self.normalizer = SkillNormalizer(self.catalog)
+        self.similarity_index_cls = similarity_index_cls
+        self.model_store = SkillModelStore(os.getenv('SKILL_MODEL_DIR', 'artifacts/skill_vectors'))
+        # 'tfidf' refits (or loads a persisted fit) on every catalog change;
+        # 'incremental' only re-vectorizes the skills that changed
+        self.vectorizer_mode = vectorizer_mode or os.getenv('SKILL_VECTORIZER', 'tfidf')
+        self.incremental_vectorizer = (
+            IncrementalSkillVectorizer() if self.vectorizer_mode == 'incremental' else None
+        )
         self.vectorizer = TfidfVectorizer()
         self.skill_vectors = None
         self.skill_names = []
-        self._load_skills()
+        # (snapshot, vectorizer, skill_vectors, similarity_index) swapped as one unit on refresh
+        self._vector_state = None
+        self._refresh_lock = threading.Lock()
+        self._load_skills(self.catalog.current())
     
-    def _load_skills(self):
-        """Load skills from database and create vector representations"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT name, description FROM skills')
-        skills_data = cursor.fetchall()
-        
-        self.skill_names = [skill[0] for skill in skills_data]
-        skill_descriptions = [f"{skill[0]} {skill[1]}" for skill in skills_data]
-        
-        if skill_descriptions:
-            self.skill_vectors = self.vectorizer.fit_transform(skill_descriptions)
-        
-        conn.close()
+    def _load_skills(self, snapshot: CatalogSnapshot):
+        """Create vector representations for the skills in a catalog snapshot"""
+        # Rows follow the snapshot order so vector indices line up with
+        # snapshot.skills in _recommend_skills
+        vectorizer = TfidfVectorizer()
+        skill_vectors = None
+        similarity_index = None
+        skill_descriptions = [f"{skill['name']} {skill['description']}" for skill in snapshot.skills]
+        
+        if skill_descriptions and self.incremental_vectorizer is not None:
+            vectorizer, skill_vectors = self.incremental_vectorizer.sync(
+                list(snapshot.names), skill_descriptions
+            )
+            similarity_index = self.similarity_index_cls(skill_vectors)
+        elif skill_descriptions:
+            # Reuse the persisted model for this exact catalog, refit only when it changed
+            catalog_hash = self.model_store.catalog_hash(skill_descriptions)
+            artifact = self.model_store.load(catalog_hash)
+            if artifact is not None:
+                vectorizer, skill_vectors, postings = artifact
+            else:
+                skill_vectors = vectorizer.fit_transform(skill_descriptions)
+                postings = InvertedSimilarityIndex.build_postings(skill_vectors)
+                self.model_store.save(catalog_hash, vectorizer, skill_vectors, postings)
+            similarity_index = self.similarity_index_cls(skill_vectors, postings=postings)
+        
+        self.vectorizer = vectorizer
+        self.skill_vectors = skill_vectors
+        self.skill_names = list(snapshot.names)
+        self._vector_state = (snapshot, vectorizer, skill_vectors, similarity_index)
+    
+    def _current_state(self):
+        """Return the vector state for the latest catalog snapshot, refitting if the catalog changed"""
+        snapshot = self.catalog.current()
+        if self._vector_state[0] is not snapshot:
+            with self._refresh_lock:
+                if self._vector_state[0] is not snapshot:
+                    self._load_skills(snapshot)
+        return self._vector_state
+    
+    def refresh(self) -> CatalogSnapshot:
+        """Pick up catalog edits now instead of on the next analysis request"""
+        return self._current_state()[0]
     
     def get_available_skills(self) -> List[Dict[str, str]]:
-        """Get all available skills from database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT name, category, description FROM skills ORDER BY category, name')
-        skills = cursor.fetchall()
-        
-        result = []
-        for skill in skills:
-            result.append({
-                'name': skill[0],
-                'category': skill[1],
-                'description': skill[2]
-            })
-        
-        conn.close()
-        return result
+        """Get all available skills from the in-memory catalog"""
+        return list(self.catalog.current().skills)
     
-    def analyze_skills(self, student_data: Dict[str, Any]) -> Dict[str, Any]:
+    def analyze_skills(self, student_data: Dict[str, Any],
+                       include: Optional[Set[str]] = None) -> Dict[str, Any]:
         """
-        Analyze student skills and identify strengths, gaps, and recommendations
+        Analyze student skills and identify strengths, gaps, and recommendations.
+        ``include`` limits the optional sections that are built (None builds all).
         """
         student_skills = student_data.get('skills', [])
         interests = student_data.get('interests', [])
         education = student_data.get('education', '')
         experience = student_data.get('experience', '')
         
-        # Get all available skills
-        available_skills = self.get_available_skills()
-        all_skill_names = [skill['name'] for skill in available_skills]
+        # Get all available skills from the current catalog snapshot
+        snapshot, vectorizer, skill_vectors, similarity_index = self._current_state()
+        available_skills = snapshot.skills
         
-        # Categorize skills
-        technical_skills = [skill for skill in available_skills if skill['category'] == 'Technical']
-        soft_skills = [skill for skill in available_skills if skill['category'] == 'Soft Skills']
+        # Represent the profile as a boolean vector over catalog indices
+        profile_mask = snapshot.profile_mask(student_skills)
+        technical_mask = snapshot.category_mask('Technical')
+        soft_mask = snapshot.category_mask('Soft Skills')
         
         # Find skill matches and gaps
-        matched_skills = []
-        skill_gaps = []
-        
-        for skill in available_skills:
-            skill_name = skill['name']
-            if skill_name in student_skills:
-                matched_skills.append(skill)
-            else:
-                skill_gaps.append(skill)
+        matched_indices = np.flatnonzero(profile_mask)
+        gap_indices = np.flatnonzero(~profile_mask)
+        matched_skills = [available_skills[i] for i in matched_indices]
         
         # Calculate skill strength score
-        skill_strength = len(matched_skills) / len(available_skills) * 100
-        
-        # Find similar skills based on interests
-        recommended_skills = self._recommend_skills(student_skills, interests, available_skills)
+        skill_strength = len(matched_indices) / len(available_skills) * 100
         
         # Analyze skill distribution
-        technical_matches = [s for s in matched_skills if s['category'] == 'Technical']
-        soft_matches = [s for s in matched_skills if s['category'] == 'Soft Skills']
+        technical_count = int(np.count_nonzero(profile_mask & technical_mask))
+        soft_count = int(np.count_nonzero(profile_mask & soft_mask))
         
-        return {
+        analysis = {
             'matched_skills': matched_skills,
-            'skill_gaps': skill_gaps[:10],  # Top 10 gaps
+            'skill_gaps': [available_skills[i] for i in gap_indices[:10]],  # Top 10 gaps
             'skill_strength_score': round(skill_strength, 2),
-            'technical_skills_count': len(technical_matches),
-            'soft_skills_count': len(soft_matches),
-            'recommended_skills': recommended_skills,
+            'technical_skills_count': technical_count,
+            'soft_skills_count': soft_count,
             'skill_distribution': {
-                'technical': len(technical_matches),
-                'soft_skills': len(soft_matches),
+                'technical': technical_count,
+                'soft_skills': soft_count,
                 'total_available': len(available_skills)
-            },
-            'strengths': self._identify_strengths(matched_skills),
-            'improvement_areas': self._identify_improvement_areas(skill_gaps, interests)
+            }
+        }
+        
+        # Optional sections are only built when requested
+        optional_sections = {
+            # Find similar skills based on interests
+            'recommended_skills': lambda: self._recommend_skills(
+                student_skills, interests, available_skills, vectorizer, similarity_index, profile_mask
+            ),
+            'strengths': lambda: self._identify_strengths(matched_skills, technical_count, soft_count),
+            'improvement_areas': lambda: self._identify_improvement_areas(snapshot, profile_mask, interests)
         }
+        for section, build in optional_sections.items():
+            if include is None or section in include:
+                analysis[section] = build()
+        
+        return analysis
     
     def _recommend_skills(self, current_skills: List[str], interests: List[str], 
-                         available_skills: List[Dict]) -> List[Dict]:
+                         available_skills: List[Dict], vectorizer,
+                         similarity_index, profile_mask: np.ndarray) -> List[Dict]:
         """Recommend skills based on current skills and interests"""
         if not current_skills and not interests:
-            return available_skills[:5]  # Return top 5 if no input
+            return list(available_skills[:5])  # Return top 5 if no input
         
         # Create a combined text for similarity matching
         combined_text = ' '.join(current_skills + interests)
         
-        if not self.skill_vectors is None and combined_text.strip():
+        if not similarity_index is None and combined_text.strip():
             # Vectorize the combined input
-            input_vector = self.vectorizer.transform([combined_text])
-            
-            # Calculate similarities
-            similarities = cosine_similarity(input_vector, self.skill_vectors)[0]
+            input_vector = vectorizer.transform([combined_text])
             
-            # Get top similar skills
-            skill_indices = np.argsort(similarities)[::-1]
-            recommended = []
-            
-            for idx in skill_indices:
-                if similarities[idx] > 0.1:  # Threshold for relevance
-                    skill = available_skills[idx]
-                    if skill['name'] not in current_skills:
-                        recommended.append({
-                            'skill': skill,
-                            'similarity_score': round(similarities[idx], 3)
-                        })
-                        if len(recommended) >= 10:
-                            break
-            
-            return recommended
+            # Top 10 similar skills above the relevance threshold, excluding current skills
+            return [
+                {'skill': available_skills[idx], 'similarity_score': round(score, 3)}
+                for idx, score in similarity_index.top_k(input_vector, 10, 0.1, profile_mask)
+            ]
         
-        return available_skills[:5]
+        return list(available_skills[:5])
     
-    def _identify_strengths(self, matched_skills: List[Dict]) -> List[str]:
+    def _identify_strengths(self, matched_skills: List[Dict], technical_count: int,
+                            soft_count: int) -> List[str]:
         """Identify key strengths from matched skills"""
         if not matched_skills:
             return ["No skills assessed yet"]
         
-        # Group by category
-        technical_count = len([s for s in matched_skills if s['category'] == 'Technical'])
-        soft_count = len([s for s in matched_skills if s['category'] == 'Soft Skills'])
-        
         strengths = []
         if technical_count > 0:
             strengths.append(f"Strong technical foundation ({technical_count} skills)")
@@ -153,7 +174,7 @@ class SkillMappingEngine:
             strengths.append(f"Good soft skills development ({soft_count} skills)")
         
         # Add specific skill strengths
-        skill_names = [s['name'] for s in matched_skills]
+        skill_names = {s['name'] for s in matched_skills}
         if 'Python Programming' in skill_names:
             strengths.append("Programming expertise")
         if 'Machine Learning' in skill_names:
@@ -163,9 +184,11 @@ class SkillMappingEngine:
         
         return strengths if strengths else ["Building skill foundation"]
     
-    def _identify_improvement_areas(self, skill_gaps: List[Dict], interests: List[str]) -> List[str]:
+    def _identify_improvement_areas(self, snapshot: CatalogSnapshot, profile_mask: np.ndarray,
+                                    interests: List[str]) -> List[str]:
         """Identify key areas for improvement"""
-        if not skill_gaps:
+        gap_mask = ~profile_mask
+        if not gap_mask.any():
             return ["All core skills covered"]
         
         # Prioritize based on interests
@@ -173,21 +196,19 @@ class SkillMappingEngine:
         
         # Check for critical missing skills
         critical_skills = ['Communication', 'Problem Solving', 'Critical Thinking']
-        missing_critical = [skill for skill in skill_gaps if skill['name'] in critical_skills]
+        missing_critical = gap_mask & snapshot.profile_mask(critical_skills)
         
-        if missing_critical:
+        if missing_critical.any():
             improvement_areas.append("Essential soft skills development")
         
         # Check for technical gaps
-        technical_gaps = [skill for skill in skill_gaps if skill['category'] == 'Technical']
-        if technical_gaps:
+        has_technical_gaps = bool((gap_mask & snapshot.category_mask('Technical')).any())
+        if has_technical_gaps:
             improvement_areas.append("Technical skill expansion")
         
         # Interest-based recommendations
         if 'Technology' in interests or 'Programming' in interests:
-            tech_skills = [s for s in skill_gaps if s['category'] == 'Technical']
-            if tech_skills:
+            if has_technical_gaps:
                 improvement_areas.append("Programming and technical skills")
         
         return improvement_areas if improvement_areas else ["General skill development"]
-
@@ -0,0 +1,110 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from typing import List, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+import sklearn
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# Bump when the on-disk layout or the way documents are built changes
+ARTIFACT_FORMAT_VERSION = 1
+
+
+class SkillModelStore:
+    """
+    Versioned on-disk store for the fitted skill TF-IDF model.
+
+    Each artifact lives in ``<root>/<catalog_hash>/`` and holds the
+    vocabulary and IDF weights plus the CSR arrays of the skill matrix and of
+    the similarity-index postings as plain ``.npy`` files, so they can be
+    memory-mapped on load. Processes whose catalog hash already has an
+    artifact skip refitting entirely.
+    """
+
+    def __init__(self, root: str = 'artifacts/skill_vectors', keep: int = 3):
+        self.root = root
+        self.keep = keep
+
+    @staticmethod
+    def catalog_hash(documents: List[str]) -> str:
+        """Hash of the documents the vectorizer is fitted on, plus model settings"""
+        digest = hashlib.sha256()
+        digest.update(f'{ARTIFACT_FORMAT_VERSION}|{sklearn.__version__}|'.encode('utf-8'))
+        digest.update(repr(sorted(TfidfVectorizer().get_params().items())).encode('utf-8'))
+        for document in documents:
+            digest.update(document.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def load(self, catalog_hash: str) -> Optional[Tuple[TfidfVectorizer, sp.csr_matrix, sp.csr_matrix]]:
+        """Return ``(vectorizer, skill_vectors, postings)`` or None if there is no usable artifact"""
+        path = os.path.join(self.root, catalog_hash)
+        try:
+            with open(os.path.join(path, 'vocabulary.json'), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            skill_vectors = self._load_csr(path, 'skill_vectors', meta['skill_vectors_shape'])
+            postings = self._load_csr(path, 'postings', meta['postings_shape'])
+            idf = np.load(os.path.join(path, 'idf.npy'))
+        except (OSError, ValueError, KeyError):
+            return None
+
+        vectorizer = TfidfVectorizer()
+        vectorizer.vocabulary_ = meta['vocabulary']
+        vectorizer.idf_ = idf
+        return vectorizer, skill_vectors, postings
+
+    def save(self, catalog_hash: str, vectorizer: TfidfVectorizer,
+             skill_vectors: sp.csr_matrix, postings: sp.csr_matrix):
+        """Write an artifact atomically; failures (e.g. read-only disks) are ignored"""
+        final_path = os.path.join(self.root, catalog_hash)
+        if os.path.isdir(final_path):
+            return
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            tmp_path = tempfile.mkdtemp(prefix='.tmp-', dir=self.root)
+            self._save_csr(tmp_path, 'skill_vectors', skill_vectors)
+            self._save_csr(tmp_path, 'postings', postings)
+            np.save(os.path.join(tmp_path, 'idf.npy'), vectorizer.idf_)
+            with open(os.path.join(tmp_path, 'vocabulary.json'), 'w', encoding='utf-8') as f:
+                json.dump({
+                    'format_version': ARTIFACT_FORMAT_VERSION,
+                    'vocabulary': {term: int(i) for term, i in vectorizer.vocabulary_.items()},
+                    'skill_vectors_shape': list(skill_vectors.shape),
+                    'postings_shape': list(postings.shape)
+                }, f)
+            try:
+                os.rename(tmp_path, final_path)
+            except OSError:
+                # Another process published the same artifact first
+                shutil.rmtree(tmp_path, ignore_errors=True)
+            self._prune(catalog_hash)
+        except OSError:
+            pass
+
+    def _prune(self, current_hash: str):
+        """Keep only the ``keep`` most recent artifacts"""
+        entries = [
+            os.path.join(self.root, name) for name in os.listdir(self.root)
+            if not name.startswith('.') and name != current_hash
+        ]
+        entries.sort(key=os.path.getmtime, reverse=True)
+        for path in entries[max(self.keep - 1, 0):]:
+            shutil.rmtree(path, ignore_errors=True)
+
+    @staticmethod
+    def _save_csr(path: str, name: str, matrix: sp.csr_matrix):
+        matrix = sp.csr_matrix(matrix)
+        for part in ('data', 'indices', 'indptr'):
+            np.save(os.path.join(path, f'{name}.{part}.npy'), getattr(matrix, part))
+
+    @staticmethod
+    def _load_csr(path: str, name: str, shape) -> sp.csr_matrix:
+        data, indices, indptr = (
+            np.load(os.path.join(path, f'{name}.{part}.npy'), mmap_mode='r')
+            for part in ('data', 'indices', 'indptr')
+        )
+        return sp.csr_matrix((data, indices, indptr), shape=tuple(shape), copy=False)
@@ -0,0 +1,130 @@
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, List, Iterable, Optional, Tuple
+
+import numpy as np
+
+from modules.skill_catalog import SkillCatalog, CatalogSnapshot
+
+# Default alternative spellings seeded into skill_aliases by init_database
+DEFAULT_ALIASES = [
+    ('python', 'Python Programming'),
+    ('py', 'Python Programming'),
+    ('ml', 'Machine Learning'),
+    ('js', 'JavaScript'),
+    ('data analytics', 'Data Analysis'),
+    ('mysql', 'SQL'),
+    ('postgresql', 'SQL'),
+    ('statistical analysis', 'Statistics'),
+    ('cloud', 'Cloud Computing'),
+    ('scrum', 'Agile'),
+    ('team work', 'Teamwork'),
+    ('communication skills', 'Communication'),
+    ('leadership skills', 'Leadership')
+]
+
+# Minimum trigram Dice similarity for a fuzzy match
+FUZZY_THRESHOLD = 0.7
+
+_WHITESPACE = re.compile(r'\s+')
+_VERSION_SUFFIX = re.compile(r'\s*v?\d+(\.\d+)*$')
+
+
+def normalize_key(text: str) -> str:
+    """Case-folded, whitespace-collapsed lookup key"""
+    return _WHITESPACE.sub(' ', str(text).casefold()).strip()
+
+
+def _trigrams(key: str) -> List[str]:
+    padded = f'  {key} '
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+class _AliasIndex:
+    """Lookup structures for one catalog snapshot"""
+
+    def __init__(self, snapshot: CatalogSnapshot, cache_size: int):
+        # Exact names win over aliases that normalize to the same key
+        self.by_key: Dict[str, int] = {}
+        for alias, name in snapshot.aliases:
+            if name in snapshot.index_by_name:
+                self.by_key.setdefault(normalize_key(alias), snapshot.index_by_name[name])
+        for i, name in enumerate(snapshot.names):
+            self.by_key[normalize_key(name)] = i
+
+        # Character trigram -> key positions, for the fuzzy fallback
+        self.keys: Tuple[str, ...] = tuple(sorted(self.by_key))
+        self.key_lengths = np.array([len(set(_trigrams(key))) for key in self.keys], dtype=np.float64)
+        postings: Dict[str, List[int]] = {}
+        for position, key in enumerate(self.keys):
+            for gram in set(_trigrams(key)):
+                postings.setdefault(gram, []).append(position)
+        self.postings: Dict[str, np.ndarray] = {
+            gram: np.array(positions, dtype=np.int32) for gram, positions in postings.items()
+        }
+
+        self.lookup = lru_cache(maxsize=cache_size)(self._lookup)
+
+    def _lookup(self, key: str) -> Optional[int]:
+        index = self.by_key.get(key)
+        if index is not None:
+            return index
+        # "python 3" -> "python"
+        stripped = _VERSION_SUFFIX.sub('', key)
+        if stripped and stripped in self.by_key:
+            return self.by_key[stripped]
+        return self._fuzzy(key)
+
+    def _fuzzy(self, key: str) -> Optional[int]:
+        grams = set(_trigrams(key))
+        hits = [self.postings[gram] for gram in grams if gram in self.postings]
+        if not hits:
+            return None
+        shared = np.bincount(np.concatenate(hits), minlength=len(self.keys))
+        scores = 2 * shared / (len(grams) + self.key_lengths)
+        best = int(np.argmax(scores))  # first maximum, i.e. the alphabetically smallest key
+        return self.by_key[self.keys[best]] if scores[best] > FUZZY_THRESHOLD else None
+
+
+class SkillNormalizer:
+    """
+    Maps free-text profile skills onto catalog skills.
+
+    Resolution order: exact case-folded name or alias, the same key with a
+    trailing version number removed ("Python 3"), then the closest catalog
+    name or alias by character-trigram Dice similarity above
+    ``FUZZY_THRESHOLD``. Lookups are memoized per catalog snapshot, so the
+    index and its LRU are rebuilt whenever the catalog or alias table changes.
+    """
+
+    def __init__(self, catalog: SkillCatalog, cache_size: int = 10000):
+        self.catalog = catalog
+        self.cache_size = cache_size
+        self._state: Optional[Tuple[CatalogSnapshot, _AliasIndex]] = None
+        self._lock = threading.Lock()
+
+    def _index(self) -> Tuple[CatalogSnapshot, _AliasIndex]:
+        snapshot = self.catalog.current()
+        state = self._state
+        if state is None or state[0] is not snapshot:
+            with self._lock:
+                state = self._state
+                if state is None or state[0] is not snapshot:
+                    state = (snapshot, _AliasIndex(snapshot, self.cache_size))
+                    self._state = state
+        return state
+
+    def phrase_table(self) -> Dict[str, str]:
+        """Normalized name/alias -> canonical name, for matching skills in free text"""
+        snapshot, index = self._index()
+        return {key: snapshot.names[position] for key, position in index.by_key.items()}
+
+    def canonicalize(self, skills: Iterable[str]) -> List[str]:
+        """Sorted, de-duplicated canonical names; unknown skills are kept as typed"""
+        snapshot, index = self._index()
+        canonical = set()
+        for raw in skills:
+            position = index.lookup(normalize_key(raw))
+            canonical.add(snapshot.names[position] if position is not None else raw)
+        return sorted(canonical)
@@ -0,0 +1,114 @@
+import base64
+import threading
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Any, Optional, Tuple
+
+from modules.skill_catalog import SkillCatalog, CatalogSnapshot
+from modules.skill_normalizer import normalize_key
+
+
+def encode_cursor(key: str, name: str) -> str:
+    return base64.urlsafe_b64encode(f'{key}\0{name}'.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        key, name = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8').split('\0')
+    except (ValueError, UnicodeError):
+        raise ValueError('Invalid cursor')
+    return key, name
+
+
+class _SearchIndex:
+    """Sorted (key, skill name) entries for one catalog snapshot"""
+
+    def __init__(self, snapshot: CatalogSnapshot):
+        self.snapshot = snapshot
+        self.name_keys = [normalize_key(name) for name in snapshot.names]
+
+        # Every word-start suffix of every name and alias, so "lear" finds "Machine Learning"
+        keys_by_skill: List[set] = [set() for _ in snapshot.names]
+        for alias, name in snapshot.aliases:
+            if name in snapshot.index_by_name:
+                keys_by_skill[snapshot.index_by_name[name]].update(self._suffixes(normalize_key(alias)))
+        for position, key in enumerate(self.name_keys):
+            keys_by_skill[position].update(self._suffixes(key))
+
+        entries = sorted(
+            (key, snapshot.names[position], position)
+            for position, keys in enumerate(keys_by_skill) for key in keys
+        )
+        self.keys = [entry[0] for entry in entries]
+        self.pairs = [(entry[0], entry[1]) for entry in entries]
+        self.positions = [entry[2] for entry in entries]
+        self.keys_by_skill = [sorted(keys) for keys in keys_by_skill]
+
+    @staticmethod
+    def _suffixes(key: str) -> List[str]:
+        words = key.split(' ')
+        return [' '.join(words[i:]) for i in range(len(words))]
+
+    def _first_match(self, position: int, prefix: str) -> Optional[str]:
+        """Smallest key of a skill that matches ``prefix``; a skill is listed only under it"""
+        if not prefix:
+            return self.name_keys[position]
+        for key in self.keys_by_skill[position]:
+            if key.startswith(prefix):
+                return key
+        return None
+
+    def search(self, prefix: str, limit: int,
+               after: Optional[Tuple[str, str]] = None) -> Tuple[List[Dict[str, str]], Optional[str]]:
+        lo = bisect_left(self.keys, prefix)
+        hi = bisect_left(self.keys, prefix[:-1] + chr(ord(prefix[-1]) + 1)) if prefix else len(self.keys)
+        if after is not None:
+            lo = max(lo, bisect_right(self.pairs, after))
+
+        results, last = [], None
+        i = lo
+        while i < hi and len(results) < limit:
+            key, position = self.keys[i], self.positions[i]
+            if self._first_match(position, prefix) == key:
+                results.append(self.snapshot.skills[position])
+                last = self.pairs[i]
+            i += 1
+        next_cursor = encode_cursor(*last) if last is not None and i < hi else None
+        return results, next_cursor
+
+
+class SkillSearch:
+    """
+    Typeahead over skill names and aliases.
+
+    Word-start suffixes of the normalized names and aliases are kept in one
+    sorted array, so a prefix query is two bisections plus a scan of at most
+    one page. Pagination is keyset-based: the cursor is the last returned
+    ``(key, name)`` entry, which stays valid across catalog reloads.
+    """
+
+    def __init__(self, catalog: SkillCatalog):
+        self.catalog = catalog
+        self._index: Optional[_SearchIndex] = None
+        self._lock = threading.Lock()
+
+    def current(self) -> _SearchIndex:
+        snapshot = self.catalog.current()
+        index = self._index
+        if index is None or index.snapshot is not snapshot:
+            with self._lock:
+                index = self._index
+                if index is None or index.snapshot is not snapshot:
+                    index = _SearchIndex(snapshot)
+                    self._index = index
+        return index
+
+    def search(self, query: str = '', limit: int = 20, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """Skills whose name or alias has a word starting with ``query``"""
+        index = self.current()
+        after = decode_cursor(cursor) if cursor else None
+        skills, next_cursor = index.search(normalize_key(query), limit, after)
+        return {
+            'skills': skills,
+            'next_cursor': next_cursor,
+            'catalog_version': index.snapshot.version
+        }
@@ -0,0 +1,78 @@
+import copy
+import os
+import shutil
+import timeit
+
+import pytest
+
+from modules.career_recommender import CareerRecommender
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SKILL_ANALYSIS = {'matched_skills': [{'name': 'Python Programming'}, {'name': 'SQL'}, {'name': 'Statistics'}]}
+STUDENT_DATA = {'interests': ['Data Science', 'AI']}
+
+
+@pytest.fixture
+def recommender(tmp_path, monkeypatch):
+    shutil.copy(os.path.join(REPO_ROOT, 'career_advisor.db'), tmp_path / 'career_advisor.db')
+    monkeypatch.chdir(tmp_path)
+    return CareerRecommender()
+
+
+def test_cached_sections_are_not_shared_between_responses(recommender):
+    first = recommender.get_recommendations(SKILL_ANALYSIS, {}, STUDENT_DATA)
+    expected = copy.deepcopy(first)
+
+    # Scribble over every dict of the first response, top level and nested
+    for career in first['top_careers']:
+        career['title'] = 'changed'
+        if career['salary_band'] is not None:
+            career['salary_band']['median'] = -1
+    for analysis in first['detailed_career_analysis'].values():
+        analysis['overview']['industry'] = 'changed'
+        analysis['career_progression']['entry_level'] = 'changed'
+        analysis['skills_analysis']['skills_breakdown']['technical'] = ['changed']
+        analysis['work_environment']['type'] = 'changed'
+        analysis['market_demand']['demand_level'] = 'changed'
+        analysis['learning_path']['learning_timeline'] = 'changed'
+    for career in first['career_comparison']['careers']:
+        career['salary_range'] = 'changed'
+
+    assert recommender.get_recommendations(SKILL_ANALYSIS, {}, STUDENT_DATA) == expected
+
+
+def test_cached_sections_are_read_only(recommender):
+    state = recommender._state
+    title = next(iter(state.career_database))
+    sections = recommender._career_sections(title, state)
+
+    with pytest.raises(TypeError):
+        sections['overview']['industry'] = 'changed'
+    with pytest.raises(TypeError):
+        sections['recommendation']['salary_band']['median'] = -1
+    assert isinstance(sections['recommendation']['required_skills'], tuple)
+
+
+def test_cache_hit_costs_no_more_than_rebuild(recommender, monkeypatch):
+    state = recommender._state
+    top_careers = [
+        (title, {'score': 70.0, 'skill_score': 60.0, 'interest_score': 80.0, 'missing_skills': ['Machine Learning'],
+                 'skill_matches': 2, 'total_required': 5})
+        for title in list(state.career_database)[:3]
+    ]
+
+    def responses():
+        for title, score_data in top_careers:
+            recommender._format_career_recommendation(title, score_data, state)
+        recommender._generate_detailed_career_analysis(top_careers, SKILL_ANALYSIS, state)
+        recommender._generate_career_comparison(top_careers, state)
+
+    responses()
+    cached = min(timeit.repeat(responses, number=200, repeat=5))
+
+    # Same responses with the sections built from scratch on every call
+    monkeypatch.setattr(recommender, '_career_sections', recommender._build_career_sections)
+    rebuilt = min(timeit.repeat(responses, number=200, repeat=5))
+
+    assert cached <= rebuilt